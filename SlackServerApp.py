@@ -1,14 +1,20 @@
 import config
-from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 import slack_sdk
-from flask import Flask, request, jsonify
-from threading import Thread
-import requests
-import json
+from flask import Flask
+from threading import Event, Lock, Thread
 import os
+import signal
+import ssl
+import sys
 import time
 from dotenv import load_dotenv
+from traffic_recorder import TRAFFIC_RECORD_PATH, install_recorder
+from plugins import PluginContext, load_plugins
+from workspaces import WORKSPACES_CONFIG, AppGroup, load_workspaces
+from leader_election import HA_MODE, LeaderElector, create_lease_store
+from structured_log import log
+import atexit
 
 # 환경 변수 로드 (.env 파일 사용)
 load_dotenv(dotenv_path='config/.env')
@@ -18,233 +24,103 @@ SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN")
 SLACK_SIGNING_SECRET = os.environ.get("SLACK_SIGNING_SECRET")
 SLACK_APP_TOKEN = os.environ.get("SLACK_APP_TOKEN") 
 RATER_CHANNEL = os.environ.get("RATER_CHANNEL")
+# Slack Web API 주소 (부하 재현 시 로컬 가짜 API로 대체 가능)
+SLACK_API_BASE_URL = os.environ.get("SLACK_API_BASE_URL", slack_sdk.WebClient.BASE_URL)
  
 # 환경 변수 디버깅
-print("=== 환경 변수 확인 ===")
-print(f"SLACK_BOT_TOKEN: {'설정됨' if SLACK_BOT_TOKEN else '❌ 없음'}")
-print(f"SLACK_SIGNING_SECRET: {'설정됨' if SLACK_SIGNING_SECRET else '❌ 없음'}")
-print(f"SLACK_APP_TOKEN: {'설정됨' if SLACK_APP_TOKEN else '❌ 없음'}")
-print(f"RATER_CHANNEL: {RATER_CHANNEL if RATER_CHANNEL else '❌ 없음'}")
-print("=====================")
-print("=====================")
-
-# 필수 환경 변수 검증
-if not SLACK_BOT_TOKEN:
-    print("❌ SLACK_BOT_TOKEN이 설정되지 않았습니다!")
-    print("config/.env 파일을 확인해주세요.")
-    exit(1)
+log.info(
+    "startup", "env_check",
+    slack_bot_token=bool(SLACK_BOT_TOKEN),
+    slack_signing_secret=bool(SLACK_SIGNING_SECRET),
+    slack_app_token=bool(SLACK_APP_TOKEN),
+    rater_channel=RATER_CHANNEL,
+    workspaces_config=WORKSPACES_CONFIG,
+    argocd_auth_token=bool(os.environ.get('ARGOCD_AUTH_TOKEN'))
+)
 
-if not SLACK_SIGNING_SECRET:
-    print("❌ SLACK_SIGNING_SECRET이 설정되지 않았습니다!")
+# 필수 환경 변수 검증 (WORKSPACES_CONFIG 사용 시 워크스페이스별 설정에서 검증)
+if not WORKSPACES_CONFIG:
+    if not SLACK_BOT_TOKEN:
+        log.error("startup", "missing_env", name="SLACK_BOT_TOKEN", hint="config/.env 파일을 확인해주세요.")
+        exit(1)
+
+    if not SLACK_SIGNING_SECRET:
+        log.error("startup", "missing_env", name="SLACK_SIGNING_SECRET")
+        exit(1)
+
+    if not SLACK_APP_TOKEN:
+        log.error("startup", "missing_env", name="SLACK_APP_TOKEN")
+        exit(1)
+
+# 워크스페이스별 Bolt App / WebClient 풀 / 전송 큐 (WORKSPACES_CONFIG 미설정 시 위 환경 변수로 단일 워크스페이스 구성)
+# SSL 컨텍스트는 모든 워크스페이스가 공유하여 호출마다 인증서 번들을 다시 읽지 않도록 함
+try:
+    workspaces = load_workspaces(
+        default_config={
+            "bot_token": SLACK_BOT_TOKEN,
+            "signing_secret": SLACK_SIGNING_SECRET,
+            "app_token": SLACK_APP_TOKEN,
+            "rater_channel": RATER_CHANNEL,
+        },
+        base_url=SLACK_API_BASE_URL,
+        ssl_context=ssl.create_default_context()
+    )
+except (OSError, ValueError, KeyError) as e:
+    log.error("startup", "workspace_config_error", path=WORKSPACES_CONFIG, error=str(e))
     exit(1)
 
-if not SLACK_APP_TOKEN:
-    print("❌ SLACK_APP_TOKEN이 설정되지 않았습니다!")
-    exit(1)
+default_workspace = next(iter(workspaces.values()))
 
-# Slack Client 역할
-slack_client = slack_sdk.WebClient(token=SLACK_BOT_TOKEN)
+# Slack Client 역할 (기본 워크스페이스)
+slack_client = default_workspace.client
 
-# Slack Server 역할
-slack_server = App(
-    token=SLACK_BOT_TOKEN,
-    signing_secret=SLACK_SIGNING_SECRET
-)
+# 채널 이름→ID, 사용자 ID→프로필 인덱스 (warm_up 에서 구축)
+slack_directory = default_workspace.directory
+
+# Slack Server 역할 (등록한 핸들러가 모든 워크스페이스 App 에 적용됨)
+slack_server = AppGroup({key: workspace.app for key, workspace in workspaces.items()})
 
 # Flask 서버 초기화
 flask_app = Flask(__name__)
 
-# Flask 서버 상태 추적
-flask_start_time = None
-
-def line_feed():
-    """라인피드 형식 반환"""
-    return "\n*************************************************************************************************\n"
-
-def warning_icon():
-    """경고 아이콘 반환"""
-    return ":alert:"
- 
-def warning_message_format(message):
-    """장애 관제시 Slack Message 형식"""
-    return line_feed() + warning_icon() + message + line_feed()
-
-def send_message(channel_id, message_text):
-    """Slack 메시지 전송"""
-    try:
-        if "정상" in message_text:
-            response = slack_client.chat_postMessage(
-                channel=channel_id,
-                text=line_feed() + ":white_check_mark: 정상 동작 :white_check_mark:" + line_feed()
-            )
-        else:
-            response = slack_client.chat_postMessage(
-                channel=channel_id,
-                text=warning_message_format(message_text)
-            )
-
-        if response.get("ok"):
-            print("****************************************************************************")
-            print("Slack Message 전송 성공!")
-            print("****************************************************************************")
-            return "success"
-        else:
-            print(f"Slack 전송 실패: {response.get('error')}")
-            return "fail"
-            
-    except Exception as e:
-        print(f"Slack 메시지 전송 중 오류: {e}")
-        return "fail"
-
-@flask_app.route('/detect', methods=['POST'])
-def detect():
-    """장애 감지 API 엔드포인트"""
-    try:
-        data = request.get_json()
-        if not data or 'data' not in data:
-            return {"status": "error", "message": "Invalid request data"}, 400
-            
-        answer = data['data']
-        result = send_message(RATER_CHANNEL, answer)
-        
-        return {"status": result}
-        
-    except Exception as e:
-        print(f"API 처리 중 오류: {e}")
-        return {"status": "error", "message": str(e)}, 500
-
-@flask_app.route('/health', methods=['GET'])
-def health_check():
-    """헬스 체크 엔드포인트"""
-    uptime = int(time.time() - flask_start_time) if flask_start_time else 0
-    return {
-        "status": "healthy", 
-        "message": "Flask server is running",
-        "uptime_seconds": uptime,
-        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-    }
-
-def check_flask_health():
-    """Flask 서버 상태 확인 함수"""
-    try:
-        response = requests.get("http://localhost:5000/health", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            uptime_minutes = data.get('uptime_seconds', 0) // 60
-            return {
-                "status": "healthy",
-                "uptime_minutes": uptime_minutes,
-                "timestamp": data.get('timestamp', 'Unknown')
-            }
-        else:
-            return {"status": "unhealthy", "error": f"HTTP {response.status_code}"}
-    except requests.exceptions.ConnectionError:
-        return {"status": "down", "error": "Connection refused - Flask 서버가 실행되지 않음"}
-    except requests.exceptions.Timeout:
-        return {"status": "timeout", "error": "응답 시간 초과"}
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+# 트래픽 기록 (TRAFFIC_RECORD_PATH 설정 시 Socket Mode 이벤트와 /detect 요청을 파일로 기록)
+if TRAFFIC_RECORD_PATH:
+    traffic_recorder = install_recorder(TRAFFIC_RECORD_PATH, slack_server, flask_app)
+    atexit.register(traffic_recorder.close)
+    log.info("startup", "traffic_recording", path=TRAFFIC_RECORD_PATH)
 
 ####################################################################################################
-# Slack 메시지 핸들러
-@slack_server.message("24x7 전환")
-def handle_hello_message(message, say):
-    """24x7 전환 메세지"""
-    say("24x7으로 전환하시겠습니까? \n관리자의 승인이 필요합니다.\n\n관리자는 \"승인합니다.\"를 입력해 주세요.")
-
-@slack_server.message("hello")
-def handle_hello_message(message, say):
-    """hello 메시지에 대한 응답"""
-    say(f"Hey there <@{message['user']}>!")
-
-@slack_server.message("ping")
-def handle_ping_message(message, say):
-    """ping 메시지에 대한 응답"""
-    say("pong! 🏓")
-
-@slack_server.message("status")
-def handle_status_message(message, say):
-    """상태 확인 메시지에 대한 응답"""
-    say("SLACK 서버가 정상 동작 중입니다! ✅")
-
-@slack_server.message("health")
-def handle_health_message(message, say):
-    """Flask 서버 헬스 체크"""
-    say("🔍 Flask 서버 상태를 확인 중...")
-    
-    health_status = check_flask_health()
-    
-    if health_status["status"] == "healthy":
-        uptime_minutes = health_status.get("uptime_minutes", 0)
-        timestamp = health_status.get("timestamp", "Unknown")
-        
-        say(f"""✅ **Flask 서버 상태: 정상**
-            📊 가동 시간: {uptime_minutes}분
-            🕐 마지막 확인: {timestamp}
-            🌐 엔드포인트: http://localhost:5000""")
-    
-    elif health_status["status"] == "down":
-        say(f"""❌ **Flask 서버 상태: 중단됨**
-            🔥 오류: {health_status.get('error', 'Unknown error')}
-            💡 Flask 서버를 다시 시작해주세요""")
-    
-    elif health_status["status"] == "timeout":
-        say(f"""⏰ **Flask 서버 상태: 응답 지연**
-            🔥 오류: {health_status.get('error', 'Unknown error')}
-            💡 서버가 과부하 상태일 수 있습니다""")
-    
-    else:
-        say(f"""⚠️ **Flask 서버 상태: 오류**
-            🔥 오류: {health_status.get('error', 'Unknown error')}
-            💡 서버 로그를 확인해주세요""")
-
-@slack_server.message("flask")
-def handle_flask_command(message, say):
-    """Flask 관련 명령어 도움말"""
-    help_text = """🤖 **Flask 서버 관리 명령어**
-
-            📋 **사용 가능한 명령어:**
-            • `health` - Flask 서버 상태 확인
-            • `flask` - 이 도움말 표시
-            • `status` - 전체 서버 상태
-            • `ping` - 연결 테스트
-
-            🔗 **Flask API 엔드포인트:**
-            • POST `/detect` - 장애 감지 메시지 전송
-            • GET `/health` - 헬스 체크
-
-            💡 **사용법:** 채팅에서 위 명령어를 입력하세요!"""
+# 명령어 플러그인 등록 (ENABLED_PLUGINS 로 선택, 기본: alerting,health,env_switch)
+plugin_context = PluginContext(
+    slack_server=slack_server,
+    slack_client=slack_client,
+    flask_app=flask_app,
+    rater_channel=default_workspace.rater_channel,
+    directory=slack_directory,
+    workspaces=workspaces
+)
+loaded_plugins = load_plugins(plugin_context)
 
-    say(help_text)
+# HA 모드: 모든 복제본이 /detect 를 처리하고, 리더만 Socket Mode 명령어/환경 전환 수행
+leader_elector = LeaderElector(create_lease_store()) if HA_MODE else None
+plugin_context.leader = leader_elector
 
 @slack_server.message("help")
 def handle_help_message(message, say):
-    """도움말 메시지"""
-    help_text = """🤖 **사용 가능한 명령어**
+    """도움말 메시지 (활성화된 플러그인의 도움말을 모아서 표시)"""
+    sections = "\n\n            ".join(plugin_context.help_sections)
+    help_text = f"""🤖 **사용 가능한 명령어** (`help` - 이 도움말)
 
-            📋 **기본 명령어:**
-            • `hello` - 인사말
-            • `ping` - 연결 테스트  
-            • `status` - 서버 상태
-            • `health` - Flask 상태 확인
-            • `flask` - Flask 명령어 도움말
-            • `help` - 이 도움말
+            {sections}
 
             💡 **사용법:** 채팅에서 위 명령어를 입력하세요!
-            🔧 **관리자:** 서버 관제 및 모니터링
-            
-            📋 **현재 구현된 기능:**
-            • Rater Bot 멘션 기능(관리자로 등록된 사용자가 \"승인합니다.\" 하였을때, 동작하는 Trigger - 현재 연결된 기능은 없음)
-            • 1회성 Log -> AI분석 -> 장애탐지 내용 및 분석 시나리오 Slack 알림 기능 (Slack 서버 실행, Log분석 실행시 동작)
-            • Flask 서버 구현 (Log 및 타 서비스에서 Slack서버로 요청 메세지 전송기능 API)
-            • help 기능 - 위의 기능과 같이 /연결테스트/상태확인/ 등 체크 기능
-            • 24x7 전환 : 해당 요청으로 Event Trigger 설정 해놓음(전환 동작 없음)"""
+            🔧 **관리자:** 서버 관제 및 모니터링"""
     
     say(help_text)
 
 # 일반 메시지 이벤트 핸들러 (모든 메시지 처리)
 @slack_server.event("message")
-def handle_message_events(body, logger):
+def handle_message_events(body):
     """모든 메시지 이벤트 처리 (로그만 기록)"""
     # 봇 자신의 메시지는 무시
     if body.get("event", {}).get("bot_id"):
@@ -256,7 +132,8 @@ def handle_message_events(body, logger):
     text = event.get("text", "")
     channel = event.get("channel", "Unknown")
     
-    logger.info(f"Message from {user} in {channel}: {text}")
+    # 고빈도 경로: 'message' 카테고리는 LOG_SAMPLE_RATES 로 샘플링되고 포맷팅은 writer 스레드에서 수행
+    log.info("message", "received", user=user, channel=channel, text=text)
     
     # 도움말 안내 (선택사항)
     # 너무 많은 응답을 피하기 위해 주석 처리
@@ -267,26 +144,64 @@ def handle_message_events(body, logger):
     #     )
 
 
-#멘션 사용으로 메세지 전달 
-@slack_server.event("app_mention")
-def handle_mention(event, say, client):
-    text = event['text']
-    print(f"텍스트 {text}")
-    # "Rater봇" 키워드 확인
-    if "승인" in text:
-        # 멘션 부분 제거하고 명령어 추출
-        user_id = event['user']
-        print(f"userID : {user_id}")
-        if user_id == "U08JGPE0ACD":say(" :ok_hand:알겠습니다.\n :white_check_mark:요청하신 동작을 수행하겠습니다.")
-        else: say(":alert: 관리자만 승인할 수 있습니다. :alert:")
+def warm_up():
+    """첫 알림도 평상시와 같은 지연으로 처리되도록 시작 시 Slack API 연결 및 인덱스 준비"""
+    started = time.perf_counter()
+    log.info("startup", "warm_up_started")
+
+    for workspace in workspaces.values():
+        # 토큰 검증 및 DNS/TLS 초기 연결 비용을 시작 단계에서 지불
+        try:
+            auth = workspace.client.auth_test()
+            log.info("startup", "auth_test", workspace=workspace.key, team=auth.get('team'), bot=auth.get('user'))
+        except Exception as e:
+            log.error("startup", "auth_test_failed", workspace=workspace.key, error=str(e))
+
+        # 채널 인덱스 구축 후 RATER_CHANNEL 이 이름이면 ID 로 변환
+        if workspace.directory.refresh_channels():
+            log.info("startup", "channel_index_built", workspace=workspace.key,
+                     channels=len(workspace.directory.channels))
+        if workspace.rater_channel:
+            workspace.rater_channel = workspace.directory.channel_id(workspace.rater_channel)
+
+    plugin_context.rater_channel = default_workspace.rater_channel
+
+    plugin_context.ready = True
+    log.info("startup", "warm_up_finished", seconds=round(time.perf_counter() - started, 3))
+
+def run_warm_up():
+    """warm-up 후 워크스페이스별 채널/사용자 인덱스 주기적 갱신 시작"""
+    warm_up()
+    for workspace in workspaces.values():
+        Thread(
+            target=workspace.directory.refresh_loop,
+            name=f"DirectoryRefreshThread-{workspace.key}",
+            daemon=True
+        ).start()
+
+# warm-up 을 시작한 프로세스 ID (gunicorn --preload 처럼 fork 된 워커에서는 다시 시작)
+_warm_up_pid = None
+_warm_up_lock = Lock()
+
+def start_warm_up():
+    """프로세스당 한 번 warm-up 을 백그라운드로 시작 (완료 전까지 GET /ready 는 503)"""
+    global _warm_up_pid
+    if _warm_up_pid == os.getpid():
+        return
+    with _warm_up_lock:
+        if _warm_up_pid == os.getpid():
+            return
+        _warm_up_pid = os.getpid()
+    Thread(target=run_warm_up, name="WarmUpThread", daemon=True).start()
 
+# WSGI 서버(gunicorn 등)로 로드되어 main() 이 실행되지 않는 경우에도 첫 요청 시 warm-up 시작
+flask_app.before_request(start_warm_up)
 
 def run_flask_server():
     """Flask 서버 실행 함수"""
-    global flask_start_time
-    flask_start_time = time.time()
+    plugin_context.flask_start_time = time.time()
     
-    print("🌐 Flask 서버 시작 (포트: 5000)")
+    log.info("flask", "starting", port=5000)
     try:
         flask_app.run(
             host='0.0.0.0',
@@ -296,41 +211,77 @@ def run_flask_server():
             threaded=True
         )
     except Exception as e:
-        print(f"Flask 서버 오류: {e}")
+        log.error("flask", "server_error", error=str(e))
 
 def run_slack_server():
     """Slack 서버 실행 함수"""
-    print("⚡ Slack 서버 시작")
+    log.info("slack", "starting", workspaces=list(workspaces))
     try:
-        handler = SocketModeHandler(slack_server, SLACK_APP_TOKEN)
-        handler.start()
+        # 워크스페이스마다 Socket Mode 연결 하나
+        handlers = [
+            SocketModeHandler(workspace.app, workspace.app_token)
+            for workspace in workspaces.values()
+        ]
+
+        def connect_all():
+            for handler in handlers:
+                handler.client.auto_reconnect_enabled = True
+                handler.connect()
+
+        def disconnect_all():
+            # 자동 재연결을 끄지 않으면 모니터 스레드가 다시 연결하여 팔로워가 이벤트를 받게 됨
+            for handler in handlers:
+                handler.client.auto_reconnect_enabled = False
+                handler.disconnect()
+
+        if leader_elector is None:
+            if len(handlers) == 1:
+                handlers[0].start()
+                return
+            connect_all()
+            Event().wait()
+            return
+
+        # 리더일 때만 Socket Mode 연결 유지 (이벤트가 팔로워로 분배되지 않도록)
+        log.info("slack", "waiting_for_leadership", holder=leader_elector.holder)
+        leader_elector.on_elected = connect_all
+        leader_elector.on_revoked = disconnect_all
+        atexit.register(leader_elector.stop)
+        leader_elector.run()
     except Exception as e:
-        print(f"Slack 서버 오류: {e}")
+        log.error("slack", "server_error", error=str(e))
 
 def main():
     """메인 실행 함수"""
-    print("=" * 60)
-    print("🚀 Slack & Flask 통합 서버 시작")
-    print("=" * 60)
+    log.info("startup", "server_starting", plugins=loaded_plugins)
+    
+    # docker stop 등의 SIGTERM 에도 정상 종료 경로(atexit)를 거쳐 트래픽 기록/로그를 닫도록 함
+    # (WSGI 서버는 자체 시그널 처리를 사용하므로 직접 실행할 때만 설치)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     
-    # Flask 서버를 별도 스레드에서 실행
+    # Flask 서버를 별도 스레드에서 먼저 실행하고, warm-up 이 끝날 때까지 GET /ready 로 트래픽 차단
     flask_thread = Thread(
         target=run_flask_server, 
         name="FlaskServerThread",
         daemon=True
     )
     flask_thread.start()
+    start_warm_up()
     
-    print("🌐 Flask 서버 스레드 시작됨")
-    print("📡 Slack 서버를 메인 스레드에서 시작합니다...")
-    print("🔗 API 엔드포인트:")
-    print("   - POST /detect : 장애 감지 메시지 전송")
-    print("   - GET  /health : 헬스 체크")
-    print("💡 종료하려면 Ctrl+C를 누르세요")
-    print("=" * 60)
+    # 플러그인이 등록한 백그라운드 작업 실행
+    for name, target in plugin_context.background_tasks:
+        Thread(target=target, name=name, daemon=True).start()
+    
+    log.info(
+        "startup", "endpoints",
+        endpoints=[f"{method} {path}" for method, path, _ in plugin_context.endpoints]
+    )
     
     # Slack 서버를 메인 스레드에서 실행 (시그널 처리를 위해)
     run_slack_server()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
+else:
+    # WSGI 서버/재생 도구에서 import 된 경우 (요청을 기다리지 않고 바로 warm-up 시작)
+    start_warm_up()
\ No newline at end of file
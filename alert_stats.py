@@ -0,0 +1,151 @@
+import math
+import os
+import re
+import threading
+import time
+
+# 알림 통계 설정 (환경 변수로 조정 가능)
+STATS_RETENTION_MINUTES = int(os.environ.get("STATS_RETENTION_MINUTES", "1440"))
+STATS_DIGEST_INTERVAL = int(os.environ.get("STATS_DIGEST_INTERVAL", "3600"))
+
+# 지연 시간 스케치: 1ms 부터 로그 스케일(비율 1.2) 구간, 오차 약 ±10%
+LATENCY_GROWTH = 1.2
+LATENCY_BINS = 64
+_LOG_GROWTH = math.log(LATENCY_GROWTH)
+
+WINDOW_PATTERN = re.compile(r"^(\d+)\s*([mhd]?)$")
+WINDOW_UNITS = {"": 1, "m": 1, "h": 60, "d": 1440}
+
+
+def latency_bin(latency_ms):
+    """지연 시간(ms)을 스케치 구간 인덱스로 변환"""
+    if latency_ms < 1:
+        return 0
+    return min(int(math.log(latency_ms) / _LOG_GROWTH) + 1, LATENCY_BINS - 1)
+
+
+def bin_value_ms(index):
+    """스케치 구간의 대표 지연 시간(ms, 구간 기하 평균) 반환"""
+    return LATENCY_GROWTH ** (index - 0.5)
+
+
+def parse_window(text, default=60):
+    """'15', '30m', '2h', '1d' 형식의 조회 구간을 분 단위로 변환"""
+    if not text:
+        return default
+    match = WINDOW_PATTERN.match(text.strip().lower())
+    if not match:
+        return None
+    return int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+
+
+class AlertStats:
+    """분 단위 버킷 링 버퍼로 알림 전송 통계를 고정 메모리로 유지"""
+
+    def __init__(self, retention_minutes=STATS_RETENTION_MINUTES, clock=time.time):
+        self.size = retention_minutes
+        self.clock = clock
+        self.minutes = [-1] * self.size
+        self.requests = [0] * self.size
+        self.sent = [0] * self.size
+        self.failures = [0] * self.size
+        # 지연 시간 히스토그램은 사용된 버킷에만 할당
+        self.latency = [None] * self.size
+        self._lock = threading.Lock()
+
+    def _slot(self, minute):
+        """해당 분의 버킷 인덱스 반환 (오래된 버킷이면 초기화) - 락 보유 상태에서 호출"""
+        index = minute % self.size
+        if self.minutes[index] != minute:
+            self.minutes[index] = minute
+            self.requests[index] = 0
+            self.sent[index] = 0
+            self.failures[index] = 0
+            self.latency[index] = None
+        return index
+
+    def record_request(self):
+        """/detect 요청 수신 기록"""
+        minute = int(self.clock() // 60)
+        with self._lock:
+            self.requests[self._slot(minute)] += 1
+
+    def record_send(self, success, latency_ms):
+        """send_message 결과 및 지연 시간 기록"""
+        minute = int(self.clock() // 60)
+        bin_index = latency_bin(latency_ms)
+        with self._lock:
+            index = self._slot(minute)
+            if success:
+                self.sent[index] += 1
+            else:
+                self.failures[index] += 1
+            histogram = self.latency[index]
+            if histogram is None:
+                histogram = self.latency[index] = [0] * LATENCY_BINS
+            histogram[bin_index] += 1
+
+    def summary(self, window_minutes=60):
+        """최근 window_minutes 분 동안의 통계 요약 반환"""
+        window_minutes = max(1, min(window_minutes, self.size))
+        now_minute = int(self.clock() // 60)
+        oldest = now_minute - window_minutes + 1
+        requests = sent = failures = 0
+        merged = [0] * LATENCY_BINS
+
+        with self._lock:
+            for minute in range(oldest, now_minute + 1):
+                index = minute % self.size
+                if self.minutes[index] != minute:
+                    continue
+                requests += self.requests[index]
+                sent += self.sent[index]
+                failures += self.failures[index]
+                histogram = self.latency[index]
+                if histogram is not None:
+                    for i, count in enumerate(histogram):
+                        merged[i] += count
+
+        total = sent + failures
+        return {
+            "window_minutes": window_minutes,
+            "detect_requests": requests,
+            "sent": sent,
+            "failures": failures,
+            "failure_rate": round(failures / total, 4) if total else 0.0,
+            "per_minute": round(total / window_minutes, 2),
+            "latency_ms": {
+                "p50": self._percentile(merged, total, 0.50),
+                "p90": self._percentile(merged, total, 0.90),
+                "p99": self._percentile(merged, total, 0.99),
+            },
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    @staticmethod
+    def _percentile(histogram, total, quantile):
+        """히스토그램에서 분위수 근사값(ms) 계산"""
+        if not total:
+            return None
+        target = quantile * total
+        cumulative = 0
+        for index, count in enumerate(histogram):
+            cumulative += count
+            if cumulative >= target:
+                return round(bin_value_ms(index), 1)
+        return round(bin_value_ms(LATENCY_BINS - 1), 1)
+
+
+def stats_message_format(summary, title="알림 통계"):
+    """통계 요약을 Slack 메시지 본문으로 변환"""
+    latency = summary["latency_ms"]
+
+    def fmt(value):
+        return f"{value}ms" if value is not None else "-"
+
+    return f"""📊 **{title} (최근 {summary['window_minutes']}분)**
+            • /detect 요청: {summary['detect_requests']}건
+            • 전송 성공: {summary['sent']}건 / 실패: {summary['failures']}건 (실패율 {summary['failure_rate'] * 100:.1f}%)
+            • 분당 전송: {summary['per_minute']}건
+            • 지연 시간: p50 {fmt(latency['p50'])} / p90 {fmt(latency['p90'])} / p99 {fmt(latency['p99'])}
+            🕐 집계 시각: {summary['timestamp']}"""
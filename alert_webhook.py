@@ -0,0 +1,177 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# 그룹 알림 설정 (환경 변수로 조정 가능)
+WEBHOOK_GROUP_TTL = int(os.environ.get("WEBHOOK_GROUP_TTL", "86400"))
+WEBHOOK_MAX_GROUPS = int(os.environ.get("WEBHOOK_MAX_GROUPS", "1000"))
+# 한 메시지에 나열할 상태별 최대 알림 수 (Slack 메시지 길이 제한 대비)
+WEBHOOK_MAX_LISTED = int(os.environ.get("WEBHOOK_MAX_LISTED", "30"))
+
+
+def alert_fingerprint(labels):
+    """fingerprint 가 없는 알림은 라벨 집합으로 식별자 생성"""
+    text = ",".join(f"{k}={labels[k]}" for k in sorted(labels))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_webhook(payload):
+    """Alertmanager / Grafana 웹훅 본문을 공통 그룹 형식으로 변환"""
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid webhook payload")
+
+    # Alertmanager 및 Grafana unified alerting (Alertmanager 호환 형식)
+    if isinstance(payload.get("alerts"), list):
+        common_labels = payload.get("commonLabels") or {}
+        alerts = []
+        for alert in payload["alerts"]:
+            labels = alert.get("labels") or {}
+            annotations = alert.get("annotations") or {}
+            alerts.append({
+                "fingerprint": alert.get("fingerprint") or alert_fingerprint(labels),
+                "status": alert.get("status", payload.get("status", "firing")),
+                "name": labels.get("alertname", "alert"),
+                "severity": labels.get("severity"),
+                "instance": labels.get("instance") or labels.get("service") or labels.get("job"),
+                "summary": annotations.get("summary") or annotations.get("description") or "",
+            })
+        group_key = payload.get("groupKey") or alert_fingerprint(payload.get("groupLabels") or common_labels)
+        title = payload.get("title") or common_labels.get("alertname") or "Alertmanager"
+        return {
+            "group_key": group_key,
+            "status": payload.get("status", "firing"),
+            "title": title,
+            "group_labels": payload.get("groupLabels") or {},
+            "alerts": alerts,
+            "truncated": payload.get("truncatedAlerts", 0),
+            "external_url": payload.get("externalURL"),
+        }
+
+    # Grafana legacy alerting
+    if "ruleName" in payload or "evalMatches" in payload:
+        status = "resolved" if payload.get("state") == "ok" else "firing"
+        rule = str(payload.get("ruleId") or payload.get("ruleName"))
+        return {
+            "group_key": f"grafana:{rule}",
+            "status": status,
+            "title": payload.get("ruleName") or payload.get("title") or "Grafana",
+            "group_labels": {},
+            "alerts": [{
+                "fingerprint": rule,
+                "status": status,
+                "name": payload.get("ruleName") or "alert",
+                "severity": (payload.get("tags") or {}).get("severity"),
+                "instance": ", ".join(m.get("metric", "") for m in payload.get("evalMatches") or []),
+                "summary": payload.get("message") or "",
+            }],
+            "truncated": 0,
+            "external_url": payload.get("ruleUrl"),
+        }
+
+    raise ValueError("Unsupported webhook payload")
+
+
+def _alert_line(alert, is_new):
+    marker = "🆕 " if is_new else ""
+    severity = f" [{alert['severity']}]" if alert.get("severity") else ""
+    instance = f" {alert['instance']}" if alert.get("instance") else ""
+    summary = f" — {alert['summary']}" if alert.get("summary") else ""
+    return f"• {marker}*{alert['name']}*{severity}{instance}{summary}"
+
+
+def _alert_section(title, alerts, new_fingerprints):
+    lines = [f"{title} ({len(alerts)})"]
+    for alert in alerts[:WEBHOOK_MAX_LISTED]:
+        lines.append(_alert_line(alert, alert["fingerprint"] in new_fingerprints))
+    if len(alerts) > WEBHOOK_MAX_LISTED:
+        lines.append(f"• … 외 {len(alerts) - WEBHOOK_MAX_LISTED}건")
+    return "\n".join(lines)
+
+
+def render_group(group, previous_statuses):
+    """그룹 알림 전체를 하나의 Slack 메시지로 렌더링 (직전 상태 대비 변경 사항 표시)"""
+    firing = [a for a in group["alerts"] if a["status"] == "firing"]
+    resolved = [a for a in group["alerts"] if a["status"] != "firing"]
+    new_firing = {a["fingerprint"] for a in firing if previous_statuses.get(a["fingerprint"]) != "firing"}
+    new_resolved = {a["fingerprint"] for a in resolved if previous_statuses.get(a["fingerprint"]) != "resolved"}
+
+    icon = "🔥" if firing else "✅"
+    labels = ", ".join(f"{k}={v}" for k, v in group["group_labels"].items())
+    lines = [f"{icon} *[{group['status'].upper()}:{len(firing)}] {group['title']}*" + (f" ({labels})" if labels else "")]
+    if previous_statuses:
+        lines.append(f"🔄 변경 사항: 신규 발생 {len(new_firing)}건 / 신규 해결 {len(new_resolved)}건")
+    if firing:
+        lines.append(_alert_section("🔥 발생 중", firing, new_firing))
+    if resolved:
+        lines.append(_alert_section("✅ 해결됨", resolved, new_resolved))
+    if group.get("truncated"):
+        lines.append(f"⚠️ Alertmanager 에서 생략된 알림: {group['truncated']}건")
+    if group.get("external_url"):
+        lines.append(f"🔗 {group['external_url']}")
+    lines.append(f"🕐 업데이트: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    return "\n".join(lines)
+
+
+def is_refiring(group, previous_statuses):
+    """모두 해결됐던 그룹에 다시 발생한 알림이 있는지 여부 (제자리 갱신만으로는 알림이 가지 않으므로 새로 게시)"""
+    if not previous_statuses or "firing" in previous_statuses.values():
+        return False
+    return any(alert["status"] == "firing" for alert in group["alerts"])
+
+
+class AlertGroupStore:
+    """groupKey → 게시된 Slack 메시지(channel, ts) 및 알림별 상태 (TTL/LRU 제한)"""
+
+    def __init__(self, ttl=WEBHOOK_GROUP_TTL, max_groups=WEBHOOK_MAX_GROUPS, clock=time.time):
+        self.ttl = ttl
+        self.max_groups = max_groups
+        self.clock = clock
+        self.groups = OrderedDict()
+        # groupKey → [락, 사용 중인 요청 수] (사용 중인 그룹만 유지)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lock_for(self, group_key):
+        """같은 그룹의 동시 요청이 메시지를 중복 게시하지 않도록 그룹별 락을 잡음
+
+        락은 잡고 있거나 기다리는 요청이 있는 동안만 유지하고, 마지막 요청이 끝나면 제거
+        """
+        with self._lock:
+            entry = self._locks.get(group_key)
+            if entry is None:
+                entry = self._locks[group_key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[group_key]
+
+    def get(self, group_key):
+        with self._lock:
+            state = self.groups.get(group_key)
+            if state is None:
+                return None
+            if state["updated_at"] + self.ttl < self.clock():
+                del self.groups[group_key]
+                return None
+            return state
+
+    def put(self, group_key, channel, ts, statuses):
+        with self._lock:
+            self.groups[group_key] = {
+                "channel": channel,
+                "ts": ts,
+                "statuses": statuses,
+                "updated_at": self.clock(),
+            }
+            self.groups.move_to_end(group_key)
+            while len(self.groups) > self.max_groups:
+                self.groups.popitem(last=False)
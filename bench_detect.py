@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from fake_slack_api import FakeSlackServer
+from replay import load_server, percentile
+
+SERVING_MODES = ("inprocess", "werkzeug", "gunicorn")
+
+
+def free_port():
+    """사용 가능한 로컬 포트 반환"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, timeout=15):
+    """서버가 포트를 열 때까지 대기"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"서버가 포트 {port} 에서 응답하지 않습니다")
+
+
+def wait_for_ready(port, timeout=30):
+    """warm-up 이 끝나 GET /ready 가 200 을 반환할 때까지 대기"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/ready", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"서버가 {timeout}초 안에 준비되지 않았습니다 (GET /ready)")
+
+
+class InProcessTarget:
+    """Flask test_client 로 HTTP 계층 없이 /detect 호출"""
+
+    def __init__(self, server):
+        self.server = server
+
+    def start(self):
+        return self
+
+    def post(self, payload):
+        response = self.server.flask_app.test_client().post("/detect", json=payload)
+        return response.status_code, (response.get_json() or {}).get("status")
+
+    def stop(self):
+        pass
+
+
+class HttpTarget:
+    """실제 HTTP 서버를 띄워 /detect 호출 (werkzeug 스레드 서버 / gunicorn)"""
+
+    def __init__(self, server, mode, workers=2, threads=8):
+        self.server = server
+        self.mode = mode
+        self.workers = workers
+        self.threads = threads
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}/detect"
+        self._local = threading.local()
+        self._httpd = None
+        self._process = None
+
+    def start(self):
+        if self.mode == "werkzeug":
+            from werkzeug.serving import make_server
+            self._httpd = make_server("127.0.0.1", self.port, self.server.flask_app, threaded=True)
+            threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        else:
+            # load_server 가 설정한 환경 변수를 gunicorn 워커가 그대로 상속
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn",
+                 "-w", str(self.workers), "--threads", str(self.threads),
+                 "-b", f"127.0.0.1:{self.port}", "--log-level", "warning",
+                 "SlackServerApp:flask_app"],
+                env=dict(os.environ),
+                stdout=subprocess.DEVNULL,
+            )
+        wait_for_port(self.port)
+        wait_for_ready(self.port)
+        return self
+
+    def post(self, payload):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        response = session.post(self.url, json=payload, timeout=30)
+        return response.status_code, response.json().get("status")
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+        if self._process:
+            self._process.terminate()
+            self._process.wait(timeout=10)
+
+
+def run_level(target, concurrency, requests_per_worker):
+    """동시성 수준 하나에 대해 부하를 걸고 처리량/지연 시간 측정"""
+    latencies = []
+    failures = [0]
+    lock = threading.Lock()
+    payload = {"data": " 벤치마크 장애 알림"}
+
+    def worker():
+        local_latencies = []
+        local_failures = 0
+        for _ in range(requests_per_worker):
+            started = time.perf_counter()
+            try:
+                status_code, status = target.post(payload)
+                if status_code >= 400 or status != "success":
+                    local_failures += 1
+            except Exception:
+                local_failures += 1
+            local_latencies.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local_latencies)
+            failures[0] += local_failures
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "failures": failures[0],
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 0.90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def main():
+    """/detect 알림 경로 벤치마크 실행 함수"""
+    parser = argparse.ArgumentParser(description="/detect 알림 경로 벤치마크 (가짜 Slack API 사용)")
+    parser.add_argument("--modes", default=",".join(SERVING_MODES), help="inprocess,werkzeug,gunicorn 중 선택")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="쉼표로 구분한 동시성 수준")
+    parser.add_argument("--requests", type=int, default=200, help="동시성 수준별 워커당 요청 수")
+    parser.add_argument("--slack-latency", type=float, default=0.02, help="가짜 Slack API 응답 지연(초)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--error-ratio", type=float, default=0.0, help="ok=false 응답 비율")
+    parser.add_argument("--gunicorn-workers", type=int, default=2)
+    parser.add_argument("--gunicorn-threads", type=int, default=8)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    fake_slack = FakeSlackServer(
+        latency=args.slack_latency,
+        rate_limit_ratio=args.rate_limit_ratio,
+        error_ratio=args.error_ratio
+    ).start()
+    server = load_server(fake_slack.base_url)
+
+    results = []
+    try:
+        for mode in args.modes.split(","):
+            if mode == "inprocess":
+                target = InProcessTarget(server)
+            else:
+                target = HttpTarget(server, mode, args.gunicorn_workers, args.gunicorn_threads)
+            target.start()
+            try:
+                for level in args.concurrency.split(","):
+                    result = run_level(target, int(level), args.requests)
+                    result["mode"] = mode
+                    results.append(result)
+                    print(json.dumps(result, ensure_ascii=False), file=sys.stderr)
+            finally:
+                target.stop()
+    finally:
+        fake_slack.stop()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": {
+            "slack_latency": args.slack_latency,
+            "rate_limit_ratio": args.rate_limit_ratio,
+            "error_ratio": args.error_ratio,
+            "requests_per_worker": args.requests,
+        },
+        "slack_api_calls": fake_slack.state.calls,
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == '__main__':
+    main()
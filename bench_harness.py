@@ -0,0 +1,68 @@
+import json
+import os
+import resource
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def rss_kb():
+    """현재 상주 메모리(KB) (/proc 를 읽을 수 없으면 최대 상주 메모리)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def report(result):
+    """자식 프로세스의 측정 결과를 BENCH_OUTPUT 파일로 전달"""
+    with open(os.environ["BENCH_OUTPUT"], "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def use_slack_api(base_url):
+    """base_url 을 지정하지 않고 만든 WebClient 도 base_url 로 요청하도록 기본값 변경 (기존 버전 측정용)"""
+    from slack_sdk.web.base_client import BaseClient
+    init = BaseClient.__init__
+    names = init.__code__.co_varnames[1:init.__code__.co_argcount]
+    defaults = list(init.__defaults__)
+    defaults[names.index("base_url") - (len(names) - len(defaults))] = base_url
+    init.__defaults__ = tuple(defaults)
+
+
+def extract_revision(revision, paths, directory):
+    """git 리비전의 파일을 directory 에 풀어 놓음 (기존 버전 비교용)"""
+    os.makedirs(directory, exist_ok=True)
+    archive = subprocess.run(["git", "-C", REPO_DIR, "archive", revision, *paths],
+                             capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+    return directory
+
+
+def run_child(script, env, workdir, pythonpath=()):
+    """workdir 에서 측정 스크립트를 자식 프로세스로 실행하고 report() 로 남긴 결과 반환
+
+    결과는 파일로만 받으므로 자식의 stdout 로그와 섞이지 않음
+    pythonpath 의 경로가 저장소보다 먼저 검색됨 (기존 버전 모듈 로드용)
+    """
+    # 서버 모듈의 'import config' 및 config/ 하위 기본 경로용 (배포 환경의 config/ 디렉터리)
+    os.makedirs(os.path.join(workdir, "config"), exist_ok=True)
+    output_path = os.path.join(workdir, "bench-result.json")
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+    child_env = dict(os.environ)
+    child_env.pop("TRAFFIC_RECORD_PATH", None)
+    child_env.update(env)
+    child_env["BENCH_OUTPUT"] = output_path
+    child_env["PYTHONPATH"] = os.pathsep.join(
+        [*pythonpath, REPO_DIR] + ([os.environ["PYTHONPATH"]] if os.environ.get("PYTHONPATH") else [])
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=workdir, env=child_env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"측정 프로세스 실패 (exit {result.returncode}):\n{result.stderr[-2000:]}")
+    with open(output_path, encoding="utf-8") as f:
+        return json.load(f)
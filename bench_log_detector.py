@@ -0,0 +1,75 @@
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from log_detector import LogAnomalyDetector
+
+# 합성 로그 템플릿 (정상 / 에러)
+INFO_TEMPLATES = [
+    "2024-05-01 12:00:{s:02d} INFO  [worker-{n}] request id={id} handled in {ms}ms",
+    "2024-05-01 12:00:{s:02d} INFO  [scheduler] job {id} finished status=200",
+    "2024-05-01 12:00:{s:02d} DEBUG [cache] hit key=user:{id} ttl={ms}",
+]
+ERROR_TEMPLATES = [
+    "2024-05-01 12:00:{s:02d} ERROR [db] connection timeout after {ms}ms host=10.0.{n}.{n}",
+    "2024-05-01 12:00:{s:02d} ERROR [api] upstream returned 503 for request id={id}",
+    "2024-05-01 12:00:{s:02d} FATAL [worker-{n}] out of memory pid={id}",
+]
+
+
+def generate_lines(count, error_ratio, seed=42):
+    """합성 로그 라인 생성"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        templates = ERROR_TEMPLATES if rng.random() < error_ratio else INFO_TEMPLATES
+        lines.append(rng.choice(templates).format(
+            s=rng.randrange(60),
+            n=rng.randrange(16),
+            id=rng.randrange(1_000_000),
+            ms=rng.randrange(5000),
+        ))
+    return lines
+
+
+def run_benchmark(lines, batch_size, seconds):
+    """가상 시간을 흘려보내며 탐지기 처리량/메모리 측정"""
+    detector = LogAnomalyDetector(on_anomaly=None)
+    per_second = max(len(lines) // seconds, 1)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for offset in range(0, len(lines), batch_size):
+        virtual_now = 1_700_000_000 + offset // per_second
+        detector.ingest(lines[offset:offset + batch_size], now=virtual_now)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = detector.stats()
+    result.update({
+        "elapsed_seconds": round(elapsed, 3),
+        "lines_per_second": int(len(lines) / elapsed),
+        "peak_memory_kb": peak // 1024,
+    })
+    return result
+
+
+def main():
+    """벤치마크 실행 함수"""
+    parser = argparse.ArgumentParser(description="로그 이상 탐지기 벤치마크")
+    parser.add_argument("--lines", type=int, default=500_000)
+    parser.add_argument("--error-ratio", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seconds", type=int, default=600, help="합성 로그가 걸쳐 있는 가상 시간(초)")
+    args = parser.parse_args()
+
+    lines = generate_lines(args.lines, args.error_ratio)
+    result = run_benchmark(lines, args.batch_size, args.seconds)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
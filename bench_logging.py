@@ -0,0 +1,46 @@
+import argparse
+import io
+import json
+import os
+import time
+
+from structured_log import AsyncJsonLogger
+
+
+def measure(logger, category, count):
+    """로그 호출 1건당 평균 소요 시간(µs) 측정"""
+    started = time.perf_counter()
+    for i in range(count):
+        logger.info(category, "received", user="U0000000", channel="C0000000", text="hello world", seq=i)
+    return (time.perf_counter() - started) / count * 1_000_000
+
+
+def measure_print(count):
+    """비교 기준: 기존 방식(f-string + print, 매 호출 flush) 1건당 소요 시간(µs)"""
+    with open(os.devnull, "w") as sink:
+        started = time.perf_counter()
+        for i in range(count):
+            print(f"Message from U0000000 in C0000000: hello world {i}", file=sink, flush=True)
+        return (time.perf_counter() - started) / count * 1_000_000
+
+
+def main():
+    """구조화 로거 호출 오버헤드 벤치마크"""
+    parser = argparse.ArgumentParser(description="구조화 로거 오버헤드 벤치마크")
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    logger = AsyncJsonLogger(stream=io.StringIO(), buffer_size=args.count * 2,
+                             sample_rates={"message": 0.1})
+    report = {
+        "enqueue_us": round(measure(logger, "detect", args.count), 3),
+        "sampled_message_us": round(measure(logger, "message", args.count), 3),
+        "print_us": round(measure_print(args.count), 3),
+    }
+    logger.flush(timeout=30)
+    report.update(logger.stats())
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import tempfile
+
+from bench_harness import extract_revision, run_child
+from fake_slack_api import FakeSlackServer
+
+# 통합 이전 버전 (SlackServerApp.py 와 slack_agent.py 를 각각 실행하던 구성)
+BASELINE_REVISION = "6c077e8"
+
+# 구성 이름 → 프로세스별 (리비전, 모듈, 활성 플러그인), 리비전이 None 이면 현재 작업 트리
+CONFIGURATIONS = {
+    "unified": [(None, "SlackServerApp", "alerting,health,env_switch")],
+    "separate": [(BASELINE_REVISION, "SlackServerApp", None), (BASELINE_REVISION, "slack_agent", None)],
+}
+
+CHILD_SCRIPT = """
+import os, resource, time
+started = time.perf_counter()
+from bench_harness import report, use_slack_api
+# 기존 버전은 SLACK_API_BASE_URL 을 지원하지 않으므로 WebClient 기본 주소를 가짜 API 로 변경
+use_slack_api(os.environ["SLACK_API_BASE_URL"])
+import MODULE
+elapsed = time.perf_counter() - started
+report({
+    "startup_seconds": round(elapsed, 3),
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+})
+"""
+
+
+def measure_process(module, plugins, base_url, workdir, pythonpath=()):
+    """서버 모듈 하나를 로드하는 프로세스의 시작 시간/메모리 측정"""
+    env = {
+        "INCIDENT_SNAPSHOT_PATH": os.path.join(workdir, "incidents.json"),
+        "SLACK_BOT_TOKEN": "xoxb-bench",
+        "SLACK_SIGNING_SECRET": "bench",
+        "SLACK_APP_TOKEN": "xapp-bench",
+        "SLACK_API_BASE_URL": base_url,
+        "RATER_CHANNEL": "C0BENCH",
+    }
+    if plugins:
+        env["ENABLED_PLUGINS"] = plugins
+    return run_child(CHILD_SCRIPT.replace("MODULE", module), env, workdir, pythonpath)
+
+
+def main():
+    """통합 프로세스와 분리 실행의 시작 시간/상주 메모리 비교"""
+    parser = argparse.ArgumentParser(description="통합 프로세스 시작 시간/메모리 벤치마크")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fake_slack = FakeSlackServer().start()
+    report = {}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            baseline_dir = extract_revision(BASELINE_REVISION, ["SlackServerApp.py", "slack_agent.py"],
+                                            os.path.join(workdir, "baseline"))
+            for name, processes in CONFIGURATIONS.items():
+                runs = []
+                for _ in range(args.repeat):
+                    measured = [
+                        measure_process(module, plugins, fake_slack.base_url, workdir,
+                                        [baseline_dir] if revision else ())
+                        for revision, module, plugins in processes
+                    ]
+                    runs.append({
+                        "startup_seconds": sum(m["startup_seconds"] for m in measured),
+                        "max_rss_kb": sum(m["max_rss_kb"] for m in measured),
+                    })
+                report[name] = {
+                    "revision": processes[0][0] or "working tree",
+                    "processes": len(processes),
+                    "socket_mode_connections": len(processes),
+                    "startup_seconds": min(r["startup_seconds"] for r in runs),
+                    "max_rss_kb": min(r["max_rss_kb"] for r in runs),
+                }
+    finally:
+        fake_slack.stop()
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import tempfile
+
+from bench_harness import run_child
+from fake_slack_api import FakeSlackServer
+
+# 워크스페이스 하나를 로드하고 /detect 로 전송 풀까지 기동한 뒤의 메모리 측정
+MEMORY_SCRIPT = """
+from bench_harness import report, rss_kb
+import SlackServerApp as server
+loaded_kb = rss_kb()
+client = server.flask_app.test_client()
+for key in server.workspaces:
+    client.post("/detect", json={"data": "bench", "workspace": key})
+report({"loaded_kb": loaded_kb, "active_kb": rss_kb()})
+"""
+
+# noisy 워크스페이스에 요청을 쏟아붓기 전과 도중의 quiet 워크스페이스 /detect 지연 측정
+ISOLATION_SCRIPT = """
+import threading, time
+from bench_harness import report
+import SlackServerApp as server
+from replay import percentile
+client = server.flask_app.test_client
+def measure_quiet():
+    latencies = []
+    for _ in range(QUIET_REQUESTS):
+        started = time.perf_counter()
+        client().post("/detect", json={"data": "quiet", "workspace": "quiet"})
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return round(percentile(latencies, 0.5) * 1000, 2), round(percentile(latencies, 0.99) * 1000, 2)
+idle_p50, idle_p99 = measure_quiet()
+noisy_status = []
+flooding = threading.Event()
+flooding.set()
+def flood():
+    while flooding.is_set():
+        response = client().post("/detect", json={"data": "noisy", "workspace": "noisy"})
+        noisy_status.append((response.status_code, (response.get_json() or {}).get("status")))
+flooders = [threading.Thread(target=flood) for _ in range(FLOOD_THREADS)]
+for thread in flooders:
+    thread.start()
+time.sleep(0.5)
+flood_p50, flood_p99 = measure_quiet()
+flooding.clear()
+for thread in flooders:
+    thread.join()
+report({
+    "quiet_idle_p50_ms": idle_p50,
+    "quiet_idle_p99_ms": idle_p99,
+    "quiet_flood_p50_ms": flood_p50,
+    "quiet_flood_p99_ms": flood_p99,
+    # 실패 응답(200 + status=fail)은 전송된 것으로 세지 않음
+    "noisy_accepted": sum(1 for _, status in noisy_status if status == "success"),
+    "noisy_rejected_429": sum(1 for code, _ in noisy_status if code == 429),
+})
+"""
+
+
+def workspace_config(count):
+    return {
+        f"ws{index}": {
+            "bot_token": f"xoxb-bench-{index}",
+            "signing_secret": "bench",
+            "app_token": f"xapp-bench-{index}",
+            "rater_channel": f"C0BENCH{index}",
+        }
+        for index in range(count)
+    }
+
+
+def run_workspaces_child(script, workspaces, base_url, workdir):
+    """워크스페이스 설정 파일로 서버 모듈을 로드하는 자식 프로세스 실행 후 측정 결과 반환"""
+    config_path = os.path.join(workdir, "workspaces.json")
+    with open(config_path, "w", encoding="utf-8") as f:
+        json.dump(workspaces, f)
+
+    return run_child(script, {
+        "WORKSPACES_CONFIG": config_path,
+        "SLACK_API_BASE_URL": base_url,
+        "ENABLED_PLUGINS": "alerting,health",
+        "INCIDENT_SNAPSHOT_PATH": os.path.join(workdir, "incidents.json"),
+        "STATS_DIGEST_INTERVAL": "0",
+    }, workdir)
+
+
+def measure_memory(counts, base_url, workdir):
+    """워크스페이스 수별 상주 메모리와 워크스페이스 1개 추가당 증가량 측정"""
+    results = {count: run_workspaces_child(MEMORY_SCRIPT, workspace_config(count), base_url, workdir) for count in counts}
+    base = results[counts[0]]
+    report = {}
+    for count, measured in results.items():
+        extra = count - counts[0]
+        report[count] = dict(measured)
+        if extra:
+            report[count]["per_extra_workspace_loaded_kb"] = (measured["loaded_kb"] - base["loaded_kb"]) // extra
+            report[count]["per_extra_workspace_active_kb"] = (measured["active_kb"] - base["active_kb"]) // extra
+        # 비교 기준: 워크스페이스마다 프로세스를 따로 띄우는 경우
+        report[count]["separate_processes_kb"] = results[1]["active_kb"] * count if 1 in results else None
+    return report
+
+
+def measure_isolation(base_url, workdir, quiet_requests, flood_threads):
+    """noisy 워크스페이스 과부하가 quiet 워크스페이스 전송 지연에 미치는 영향 측정"""
+    workspaces = {
+        "quiet": {"bot_token": "xoxb-quiet", "signing_secret": "bench",
+                  "app_token": "xapp-quiet", "rater_channel": "C0QUIET", "rate_limit": 0},
+        "noisy": {"bot_token": "xoxb-noisy", "signing_secret": "bench",
+                  "app_token": "xapp-noisy", "rater_channel": "C0NOISY",
+                  "rate_limit": 5, "burst": 5, "queue_size": 20},
+    }
+    script = (ISOLATION_SCRIPT
+              .replace("QUIET_REQUESTS", str(quiet_requests))
+              .replace("FLOOD_THREADS", str(flood_threads)))
+    return run_workspaces_child(script, workspaces, base_url, workdir)
+
+
+def main():
+    """워크스페이스 추가당 메모리 및 워크스페이스 간 격리 벤치마크"""
+    parser = argparse.ArgumentParser(description="멀티 워크스페이스 메모리/격리 벤치마크")
+    parser.add_argument("--counts", default="1,2,5,10", help="측정할 워크스페이스 수 (쉼표 구분)")
+    parser.add_argument("--quiet-requests", type=int, default=50)
+    # noisy 대기열(20)보다 많아야 대기열이 가득 차 429 가 발생
+    parser.add_argument("--flood-threads", type=int, default=32)
+    parser.add_argument("--slack-latency", type=float, default=0.01, help="가짜 Slack API 응답 지연(초)")
+    args = parser.parse_args()
+
+    counts = sorted(int(count) for count in args.counts.split(","))
+    fake_slack = FakeSlackServer(latency=args.slack_latency).start()
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            report = {
+                "memory": measure_memory(counts, fake_slack.base_url, workdir),
+                "isolation": measure_isolation(fake_slack.base_url, workdir, args.quiet_requests,
+                                               args.flood_threads),
+            }
+    finally:
+        fake_slack.stop()
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class FakeSlackState:
+    """가짜 Slack Web API 호출 기록 및 응답 설정"""
+
+    def __init__(self, latency=0.0, rate_limit_ratio=0.0, error_ratio=0.0, retry_after=1):
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.error_ratio = error_ratio
+        self.retry_after = retry_after
+        self.calls = {}
+        self.rate_limited = 0
+        self.errors = 0
+        self._ts = 0
+        self._lock = threading.Lock()
+
+    def record(self, method):
+        """API 호출 횟수 기록 후 메시지 ts 발급"""
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self._ts += 1
+            return f"{int(time.time())}.{self._ts:06d}"
+
+    def pick_failure(self):
+        """설정된 비율에 따라 '429' / 'error' / None 중 하나 선택"""
+        roll = random.random()
+        if roll < self.rate_limit_ratio:
+            with self._lock:
+                self.rate_limited += 1
+            return "429"
+        if roll < self.rate_limit_ratio + self.error_ratio:
+            with self._lock:
+                self.errors += 1
+            return "error"
+        return None
+
+
+def fake_response(method, params, ts):
+    """Slack Web API 메서드별 최소 성공 응답 생성"""
+    channel = params.get("channel", "C00000000")
+    if method == "auth.test":
+        return {"ok": True, "url": "https://fake.slack.com/", "team": "fake", "user": "bot",
+                "team_id": "T00000000", "user_id": "U00000000", "bot_id": "B00000000"}
+    if method in ("chat.postMessage", "chat.update"):
+        return {"ok": True, "channel": channel, "ts": params.get("ts") or ts,
+                "message": {"text": params.get("text", ""), "ts": params.get("ts") or ts}}
+    if method == "conversations.list":
+        return {"ok": True, "channels": [], "response_metadata": {"next_cursor": ""}}
+    if method == "users.info":
+        user = params.get("user", "U00000000")
+        return {"ok": True, "user": {"id": user, "name": user.lower(), "profile": {}}}
+    return {"ok": True}
+
+
+class FakeSlackHandler(BaseHTTPRequestHandler):
+    """/api/<method> 요청에 가짜 응답을 돌려주는 HTTP 핸들러"""
+
+    def do_POST(self):
+        state = self.server.state
+        method = self.path.split("?")[0].rsplit("/", 1)[-1]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+
+        if self.headers.get("Content-Type", "").startswith("application/json") and body:
+            params = json.loads(body)
+        else:
+            params = {k: v[0] for k, v in parse_qs(body).items()}
+
+        ts = state.record(method)
+        if state.latency:
+            time.sleep(state.latency)
+
+        failure = state.pick_failure()
+        if failure == "429":
+            self._send_json(429, {"ok": False, "error": "ratelimited"},
+                            headers={"Retry-After": str(state.retry_after)})
+        elif failure == "error":
+            self._send_json(200, {"ok": False, "error": "internal_error"})
+        else:
+            self._send_json(200, fake_response(method, params, ts))
+
+    do_GET = do_POST
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 부하 측정 시 stderr 출력이 병목이 되지 않도록 접근 로그 생략
+        pass
+
+
+class FakeSlackServer:
+    """로컬 가짜 Slack Web API 서버 (별도 스레드에서 실행)"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, rate_limit_ratio=0.0, error_ratio=0.0):
+        self.httpd = ThreadingHTTPServer((host, port), FakeSlackHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = FakeSlackState(
+            latency=latency,
+            rate_limit_ratio=rate_limit_ratio,
+            error_ratio=error_ratio
+        )
+        self.thread = None
+
+    @property
+    def state(self):
+        return self.httpd.state
+
+    @property
+    def base_url(self):
+        """slack_sdk.WebClient(base_url=...) 에 전달할 주소"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="FakeSlackThread", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
@@ -0,0 +1,185 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from structured_log import log
+
+# 장애 상관관계 설정 (환경 변수로 조정 가능)
+INCIDENT_TTL = int(os.environ.get("INCIDENT_TTL", "900"))
+INCIDENT_KEY_LABELS = os.environ.get("INCIDENT_KEY_LABELS", "service,error")
+INCIDENT_SNAPSHOT_PATH = os.environ.get("INCIDENT_SNAPSHOT_PATH", "config/incidents.json")
+INCIDENT_SNAPSHOT_INTERVAL = int(os.environ.get("INCIDENT_SNAPSHOT_INTERVAL", "10"))
+INCIDENT_BROADCAST_ON_ESCALATION = os.environ.get("INCIDENT_BROADCAST_ON_ESCALATION", "true").lower() == "true"
+
+# 메시지 본문에서 라벨을 추출하는 기본 규칙 (라벨 이름 → 정규식, 첫 번째 그룹 사용)
+DEFAULT_LABEL_PATTERNS = {
+    "service": r"(?:service|svc|app)\s*[=:]\s*([\w.-]+)",
+    "error": r"\b(\w+(?:Error|Exception|Timeout))\b",
+    "severity": r"\b(critical|major|minor|warning|info)\b",
+}
+
+SEVERITY_RANK = {"info": 0, "warning": 1, "minor": 2, "major": 3, "critical": 4}
+
+
+def load_label_patterns():
+    """INCIDENT_LABEL_PATTERNS(JSON) 로 기본 추출 규칙을 덮어쓴 정규식 목록 반환"""
+    patterns = dict(DEFAULT_LABEL_PATTERNS)
+    override = os.environ.get("INCIDENT_LABEL_PATTERNS")
+    if override:
+        patterns.update(json.loads(override))
+    return {name: re.compile(pattern, re.IGNORECASE) for name, pattern in patterns.items()}
+
+
+class IncidentIndex:
+    """장애 키 → 최초 알림 메시지(ts) 인덱스 (만료 및 스냅샷 저장 지원)"""
+
+    def __init__(self, key_labels=INCIDENT_KEY_LABELS, ttl=INCIDENT_TTL,
+                 snapshot_path=INCIDENT_SNAPSHOT_PATH, label_patterns=None, clock=time.time):
+        self.key_labels = [name.strip() for name in key_labels.split(",") if name.strip()]
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self.label_patterns = label_patterns or load_label_patterns()
+        self.clock = clock
+        # key → {"channel", "ts", "severity", "expires_at", "count"}
+        self.incidents = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        # key → [Lock, 사용 중인 요청 수]
+        self._locks = {}
+
+    def extract_labels(self, text, labels=None):
+        """요청 라벨을 우선 사용하고, 없는 라벨은 본문에서 정규식으로 추출"""
+        extracted = {k: str(v) for k, v in (labels or {}).items()}
+        for name, pattern in self.label_patterns.items():
+            if name in extracted:
+                continue
+            match = pattern.search(text)
+            if match:
+                extracted[name] = match.group(1)
+        return extracted
+
+    def key_for(self, labels):
+        """키 라벨이 모두 있을 때만 장애 키 생성 (없으면 상관관계 없음)"""
+        values = [labels.get(name) for name in self.key_labels]
+        if not values or not all(values):
+            return None
+        return "|".join(value.lower() for value in values)
+
+    @contextmanager
+    def lock_for(self, key):
+        """같은 장애의 동시 알림이 최초 메시지를 중복 게시하지 않도록 키별 락을 잡음
+
+        락은 잡고 있거나 기다리는 요청이 있는 동안만 유지하고, 마지막 요청이 끝나면 제거
+        """
+        with self._lock:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    def lookup(self, key):
+        """만료되지 않은 장애 항목 반환"""
+        with self._lock:
+            incident = self.incidents.get(key)
+            if incident is None:
+                return None
+            if incident["expires_at"] < self.clock():
+                del self.incidents[key]
+                self._dirty = True
+                return None
+            return dict(incident)
+
+    def open(self, key, channel, ts, severity=None):
+        """새 장애의 최초 알림 메시지 등록"""
+        with self._lock:
+            self.incidents[key] = {
+                "channel": channel,
+                "ts": ts,
+                "severity": severity,
+                "expires_at": self.clock() + self.ttl,
+                "count": 1,
+            }
+            self._dirty = True
+
+    def touch(self, key, severity=None):
+        """후속 알림 반영 (만료 연장, 심각도 상승 여부 반환)"""
+        with self._lock:
+            incident = self.incidents.get(key)
+            if incident is None:
+                return False
+            incident["expires_at"] = self.clock() + self.ttl
+            incident["count"] += 1
+            escalated = (
+                severity is not None
+                and SEVERITY_RANK.get(severity.lower(), -1) > SEVERITY_RANK.get((incident["severity"] or "").lower(), -1)
+            )
+            if escalated:
+                incident["severity"] = severity
+            self._dirty = True
+            return escalated
+
+    def load(self):
+        """스냅샷 파일에서 만료되지 않은 항목 복원"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return 0
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            log.error("incident", "snapshot_load_error", path=self.snapshot_path, error=str(e))
+            return 0
+
+        now = self.clock()
+        with self._lock:
+            self.incidents = {k: v for k, v in snapshot.items() if v.get("expires_at", 0) >= now}
+        return len(self.incidents)
+
+    def save(self):
+        """변경 사항이 있으면 만료 항목을 정리하고 스냅샷 파일을 원자적으로 교체"""
+        if not self.snapshot_path:
+            return False
+        now = self.clock()
+        with self._lock:
+            if not self._dirty:
+                return False
+            self.incidents = {k: v for k, v in self.incidents.items() if v["expires_at"] >= now}
+            snapshot = json.dumps(self.incidents, ensure_ascii=False)
+            self._dirty = False
+
+        temp_path = None
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # 같은 경로를 공유하는 워커/복제본끼리 임시 파일이 겹치지 않도록 고유 이름 사용
+            fd, temp_path = tempfile.mkstemp(
+                dir=directory or ".", prefix=os.path.basename(self.snapshot_path) + ".", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(temp_path, self.snapshot_path)
+            return True
+        except Exception as e:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            self._dirty = True
+            log.error("incident", "snapshot_save_error", path=self.snapshot_path, error=str(e))
+            return False
+
+    def snapshot_loop(self, interval=INCIDENT_SNAPSHOT_INTERVAL):
+        """주기적으로 스냅샷 저장"""
+        while True:
+            time.sleep(interval)
+            self.save()
@@ -0,0 +1,185 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from structured_log import log
+
+# HA 모드 설정 (환경 변수로 조정 가능)
+HA_MODE = os.environ.get("HA_MODE", "false").lower() == "true"
+LEADER_LEASE_STORE = os.environ.get("LEADER_LEASE_STORE", "sqlite:///config/leader.db")
+LEADER_LEASE_NAME = os.environ.get("LEADER_LEASE_NAME", "slack-server")
+LEADER_LEASE_TTL = float(os.environ.get("LEADER_LEASE_TTL", "10"))
+
+# 임대 만료 전에 리더 권한을 스스로 내려놓는 비율 (시계 오차/GC 정지 대비)
+LEASE_SAFETY_RATIO = 0.8
+
+
+class LeaseStore:
+    """리더 임대(lease) 저장소 인터페이스"""
+
+    def try_acquire(self, name, holder, ttl):
+        """임대 획득/갱신 성공 시 펜싱 토큰, 실패 시 None 반환"""
+        raise NotImplementedError
+
+    def release(self, name, holder):
+        """보유 중인 임대를 즉시 해제"""
+        raise NotImplementedError
+
+    def current(self, name):
+        """현재 임대 정보 (holder, token, expires_at) 반환"""
+        raise NotImplementedError
+
+    def validate(self, name, token):
+        """펜싱 토큰이 현재 유효한 임대의 토큰인지 확인"""
+        lease = self.current(name)
+        return bool(lease) and lease["token"] == token and lease["expires_at"] >= time.time()
+
+
+class SqliteLeaseStore(LeaseStore):
+    """SQLite 파일 잠금 기반 임대 저장소 (단일 호스트/로컬 테스트용)"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "name TEXT PRIMARY KEY, holder TEXT, token INTEGER, expires_at REAL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def try_acquire(self, name, holder, ttl):
+        now = time.time()
+        conn = self._connect()
+        try:
+            # 쓰기 잠금을 먼저 잡아 동시 획득 시도를 직렬화
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT holder, token, expires_at FROM leases WHERE name = ?", (name,)
+            ).fetchone()
+
+            if row is None:
+                token = 1
+                conn.execute("INSERT INTO leases VALUES (?, ?, ?, ?)", (name, holder, token, now + ttl))
+            elif row[0] == holder and row[2] >= now:
+                token = row[1]
+                conn.execute("UPDATE leases SET expires_at = ? WHERE name = ?", (now + ttl, name))
+            elif row[2] < now:
+                # 만료된 임대 인수: 펜싱 토큰 증가
+                token = row[1] + 1
+                conn.execute(
+                    "UPDATE leases SET holder = ?, token = ?, expires_at = ? WHERE name = ?",
+                    (holder, token, now + ttl, name)
+                )
+            else:
+                token = None
+            conn.execute("COMMIT")
+            return token
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def release(self, name, holder):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE leases SET expires_at = 0 WHERE name = ? AND holder = ?", (name, holder)
+            )
+        finally:
+            conn.close()
+
+    def current(self, name):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT holder, token, expires_at FROM leases WHERE name = ?", (name,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"holder": row[0], "token": row[1], "expires_at": row[2]}
+
+
+def create_lease_store(url=LEADER_LEASE_STORE):
+    """'sqlite:///경로' 형식의 주소로 임대 저장소 생성"""
+    if url.startswith("sqlite:///"):
+        return SqliteLeaseStore(url[len("sqlite:///"):])
+    raise ValueError(f"지원하지 않는 lease 저장소입니다: {url}")
+
+
+class LeaderElector:
+    """임대 기반 리더 선출 (리더만 명령어/환경 전환 수행)"""
+
+    def __init__(self, store, name=LEADER_LEASE_NAME, holder=None, ttl=LEADER_LEASE_TTL,
+                 on_elected=None, on_revoked=None):
+        self.store = store
+        self.name = name
+        self.holder = holder or f"{socket.gethostname()}-{os.getpid()}"
+        self.ttl = ttl
+        self.on_elected = on_elected
+        self.on_revoked = on_revoked
+        self.token = None
+        self.valid_until = 0.0
+        self._stopped = threading.Event()
+
+    def is_leader(self):
+        """임대 안전 구간 안에서 리더인지 여부"""
+        return self.token is not None and time.monotonic() < self.valid_until
+
+    def validate(self, token):
+        """작업 직전에 펜싱 토큰이 여전히 유효한지 저장소에서 확인"""
+        return self.is_leader() and self.token == token and self.store.validate(self.name, token)
+
+    def step(self):
+        """임대 획득/갱신을 한 번 시도하고 리더 상태 변경 시 콜백 호출"""
+        started = time.monotonic()
+        store_error = False
+        try:
+            token = self.store.try_acquire(self.name, self.holder, self.ttl)
+        except Exception as e:
+            log.error("leader", "lease_renew_error", holder=self.holder, error=str(e))
+            token = None
+            store_error = True
+
+        was_leader = self.token is not None
+        if token is not None:
+            self.token = token
+            self.valid_until = started + self.ttl * LEASE_SAFETY_RATIO
+            if not was_leader:
+                log.info("leader", "elected", holder=self.holder, fencing_token=token)
+                if self.on_elected:
+                    self.on_elected()
+        elif was_leader and (not store_error or not self.is_leader()):
+            # 다른 복제본이 임대를 가져갔거나, 저장소 장애로 안전 구간이 지난 경우
+            log.warning("leader", "revoked", holder=self.holder)
+            self.token = None
+            if self.on_revoked:
+                self.on_revoked()
+
+    def run(self):
+        """stop() 호출 전까지 TTL 의 1/3 주기로 임대 갱신"""
+        while not self._stopped.is_set():
+            self.step()
+            self._stopped.wait(self.ttl / 3)
+
+    def stop(self):
+        """선출 루프 종료 및 임대 해제 (다른 복제본이 즉시 인수 가능)"""
+        self._stopped.set()
+        if self.token is not None:
+            try:
+                self.store.release(self.name, self.holder)
+            except Exception as e:
+                log.error("leader", "lease_release_error", holder=self.holder, error=str(e))
+            self.token = None
+
+    def role(self):
+        return "leader" if self.is_leader() else "follower"
@@ -0,0 +1,187 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# 로그 이상 탐지 설정 (환경 변수로 조정 가능)
+LOG_BUCKET_SECONDS = int(os.environ.get("LOG_BUCKET_SECONDS", "10"))
+LOG_WINDOW_BUCKETS = int(os.environ.get("LOG_WINDOW_BUCKETS", "30"))
+LOG_MAX_TEMPLATES = int(os.environ.get("LOG_MAX_TEMPLATES", "1000"))
+LOG_MIN_ERRORS = int(os.environ.get("LOG_MIN_ERRORS", "5"))
+LOG_SIGMA = float(os.environ.get("LOG_SIGMA", "3.0"))
+# 기준 평균 대비 최소 배율 (표준편차 조건만으로는 정상 범위 흔들림에도 알림이 가므로 함께 적용)
+LOG_MIN_RATIO = float(os.environ.get("LOG_MIN_RATIO", "2.0"))
+LOG_ALERT_COOLDOWN = int(os.environ.get("LOG_ALERT_COOLDOWN", "300"))
+# 편차 판단에 필요한 최소 과거 버킷 수 (재시작 직후 정상 에러율로 알림이 가지 않도록)
+LOG_MIN_HISTORY_BUCKETS = int(os.environ.get("LOG_MIN_HISTORY_BUCKETS", "6"))
+# true 면 이력이 없는 신규 템플릿도 LOG_MIN_ERRORS 도달 시 1회 알림
+LOG_ALERT_NOVEL = os.environ.get("LOG_ALERT_NOVEL", "false").lower() == "true"
+
+# 에러 라인 판별 및 템플릿 추출용 정규식
+ERROR_PATTERN = re.compile(r"\b(?:ERROR|FATAL|CRITICAL|Exception|Traceback)\b")
+MASK_PATTERN = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|0x[0-9a-fA-F]+"
+    r"|\d+"
+)
+TEMPLATE_MAX_LENGTH = 256
+
+
+def extract_template(line):
+    """로그 라인에서 숫자/ID 등 가변 값을 마스킹한 템플릿 반환"""
+    return MASK_PATTERN.sub("<*>", line[:TEMPLATE_MAX_LENGTH]).strip()
+
+
+class TemplateWindow:
+    """템플릿별 버킷 단위 에러 건수 링 버퍼"""
+
+    __slots__ = ("counts", "bucket", "started", "threshold", "last_alert", "sample")
+
+    def __init__(self, window_buckets, bucket):
+        self.counts = [0] * window_buckets
+        self.bucket = bucket
+        self.started = bucket
+        self.threshold = None
+        self.last_alert = 0.0
+        self.sample = ""
+
+    def advance(self, bucket, min_errors, sigma, min_history, min_ratio):
+        """새 버킷으로 이동하며 경과한 버킷을 비우고 기준 임계치를 재계산 (이력 부족 시 None)"""
+        size = len(self.counts)
+        gap = bucket - self.bucket
+        if gap <= 0:
+            return
+        for offset in range(1, min(gap, size) + 1):
+            self.counts[(self.bucket + offset) % size] = 0
+        self.bucket = bucket
+
+        # 템플릿이 처음 관측된 이후 실제로 지나간 과거 버킷만 사용 (초기 0 버킷이 평균/표준편차를 낮추지 않도록)
+        filled = min(bucket - self.started, size - 1)
+        if filled < min_history:
+            self.threshold = None
+            return
+        history = [self.counts[(bucket - offset) % size] for offset in range(1, filled + 1)]
+        mean = sum(history) / len(history)
+        variance = sum((c - mean) ** 2 for c in history) / len(history)
+        self.threshold = max(min_errors, mean + sigma * variance ** 0.5, mean * min_ratio)
+
+
+class LogAnomalyDetector:
+    """스트리밍 로그 라인의 템플릿별 에러율을 추적하여 급증 시 콜백 호출"""
+
+    def __init__(self, on_anomaly=None,
+                 bucket_seconds=LOG_BUCKET_SECONDS,
+                 window_buckets=LOG_WINDOW_BUCKETS,
+                 max_templates=LOG_MAX_TEMPLATES,
+                 min_errors=LOG_MIN_ERRORS,
+                 sigma=LOG_SIGMA,
+                 min_ratio=LOG_MIN_RATIO,
+                 cooldown=LOG_ALERT_COOLDOWN,
+                 min_history=LOG_MIN_HISTORY_BUCKETS,
+                 alert_novel=LOG_ALERT_NOVEL,
+                 clock=time.time):
+        self.on_anomaly = on_anomaly
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = max(window_buckets, 2)
+        self.max_templates = max_templates
+        self.min_errors = min_errors
+        self.sigma = sigma
+        self.min_ratio = min_ratio
+        self.cooldown = cooldown
+        self.min_history = max(1, min(min_history, self.window_buckets - 1))
+        self.alert_novel = alert_novel
+        self.clock = clock
+
+        # 템플릿 수 상한을 두어 메모리 사용량을 고정 (LRU 제거)
+        self.templates = OrderedDict()
+        self.total_lines = 0
+        self.error_lines = 0
+        self.anomalies = 0
+        self._lock = threading.Lock()
+
+    def ingest(self, lines, now=None):
+        """로그 라인 묶음을 처리하고 감지된 이상 목록 반환"""
+        now = self.clock() if now is None else now
+        bucket = int(now // self.bucket_seconds)
+        detected = []
+        search = ERROR_PATTERN.search
+
+        with self._lock:
+            count = 0
+            for line in lines:
+                count += 1
+                if search(line) is None:
+                    continue
+                anomaly = self._record_error(line, bucket, now)
+                if anomaly:
+                    detected.append(anomaly)
+            self.total_lines += count
+            self.anomalies += len(detected)
+
+        # Slack 전송 등 느린 콜백은 락 밖에서 실행
+        if self.on_anomaly:
+            for anomaly in detected:
+                self.on_anomaly(anomaly)
+        return detected
+
+    def _record_error(self, line, bucket, now):
+        """에러 라인을 템플릿 윈도우에 반영하고 임계치 초과 시 이상 정보 반환"""
+        self.error_lines += 1
+        template = extract_template(line)
+        window = self.templates.get(template)
+        if window is None:
+            if len(self.templates) >= self.max_templates:
+                self.templates.popitem(last=False)
+            window = TemplateWindow(self.window_buckets, bucket)
+            self.templates[template] = window
+        else:
+            self.templates.move_to_end(template)
+            window.advance(bucket, self.min_errors, self.sigma, self.min_history, self.min_ratio)
+
+        index = bucket % self.window_buckets
+        window.counts[index] += 1
+        window.sample = line
+
+        threshold = window.threshold
+        novel = threshold is None
+        if novel:
+            # 기준 이력이 쌓이기 전에는 편차를 판단하지 않음 (LOG_ALERT_NOVEL 설정 시 신규 템플릿으로 1회 알림)
+            if not self.alert_novel or window.last_alert:
+                return None
+            threshold = self.min_errors
+        current = window.counts[index]
+        if current < threshold or now - window.last_alert < self.cooldown:
+            return None
+
+        window.last_alert = now
+        return {
+            "template": template,
+            "count": current,
+            "threshold": round(threshold, 2),
+            "bucket_seconds": self.bucket_seconds,
+            "sample": line.strip(),
+            "novel": novel,
+        }
+
+    def stats(self):
+        """현재 탐지기 상태 요약 반환"""
+        with self._lock:
+            return {
+                "total_lines": self.total_lines,
+                "error_lines": self.error_lines,
+                "templates": len(self.templates),
+                "anomalies": self.anomalies,
+            }
+
+
+def anomaly_message_format(anomaly):
+    """로그 이상 탐지 결과를 Slack 메시지 본문으로 변환"""
+    title = "신규 에러 로그 템플릿 감지" if anomaly.get("novel") else "로그 에러율 급증 감지"
+    return (
+        f" {title}\n"
+        f"템플릿: `{anomaly['template']}`\n"
+        f"최근 {anomaly['bucket_seconds']}초 에러 건수: {anomaly['count']} "
+        f"(임계치 {anomaly['threshold']})\n"
+        f"샘플: {anomaly['sample']}"
+    )
@@ -0,0 +1,80 @@
+import importlib
+import os
+
+# 기본 활성화 플러그인 (ENABLED_PLUGINS 환경 변수로 변경 가능)
+DEFAULT_PLUGINS = "alerting,health,env_switch"
+
+
+class PluginContext:
+    """플러그인이 공유하는 Slack App / WebClient / Flask 서버 및 등록 정보"""
+
+    def __init__(self, slack_server, slack_client, flask_app, rater_channel=None, directory=None,
+                 workspaces=None):
+        self.slack_server = slack_server
+        self.slack_client = slack_client
+        self.flask_app = flask_app
+        self.rater_channel = rater_channel
+        # 채널/사용자 인덱스 (slack_directory.SlackDirectory)
+        self.directory = directory
+        # 워크스페이스 key → workspaces.Workspace (첫 번째가 기본 워크스페이스)
+        self.workspaces = workspaces or {}
+        self.flask_start_time = None
+        # warm-up 완료 여부 (GET /ready)
+        self.ready = False
+        # HA 모드의 리더 선출기 (leader_election.LeaderElector, 단일 실행 시 None)
+        self.leader = None
+        # help 명령어에 표시할 플러그인별 도움말
+        self.help_sections = []
+        # main() 에서 데몬 스레드로 실행할 (스레드 이름, 함수) 목록
+        self.background_tasks = []
+        # 시작 시 출력할 (메서드, 경로, 설명) 목록
+        self.endpoints = []
+
+    def add_help(self, text):
+        self.help_sections.append(text)
+
+    def add_background_task(self, name, target):
+        self.background_tasks.append((name, target))
+
+    def add_endpoint(self, method, path, description):
+        self.endpoints.append((method, path, description))
+
+    @property
+    def default_workspace(self):
+        return next(iter(self.workspaces.values()), None)
+
+    def workspace(self, key=None):
+        """key 에 해당하는 워크스페이스 반환 (key 미지정 시 기본 워크스페이스, 없으면 None)"""
+        if not key:
+            return self.default_workspace
+        return self.workspaces.get(key)
+
+    def workspace_for_token(self, token):
+        """Bolt 리스너에 주입된 client 의 봇 토큰으로 이벤트가 온 워크스페이스 반환"""
+        for workspace in self.workspaces.values():
+            if workspace.bot_token == token:
+                return workspace
+        return self.default_workspace
+
+    def is_leader(self):
+        """명령어/환경 전환을 수행해도 되는 복제본인지 여부 (단일 실행 시 항상 True)"""
+        return self.leader is None or self.leader.is_leader()
+
+    def role(self):
+        return self.leader.role() if self.leader else "standalone"
+
+
+def enabled_plugins():
+    """ENABLED_PLUGINS 환경 변수에서 활성화할 플러그인 이름 목록 반환"""
+    names = os.environ.get("ENABLED_PLUGINS", DEFAULT_PLUGINS)
+    return [name.strip() for name in names.split(",") if name.strip()]
+
+
+def load_plugins(context, names=None):
+    """플러그인 모듈을 불러와 공유 App/Flask 서버에 핸들러 등록"""
+    loaded = []
+    for name in names or enabled_plugins():
+        module = importlib.import_module(f"plugins.{name}")
+        module.register(context)
+        loaded.append(name)
+    return loaded
@@ -0,0 +1,352 @@
+import atexit
+import threading
+import time
+
+from flask import request
+
+from alert_stats import AlertStats, STATS_DIGEST_INTERVAL, parse_window, stats_message_format
+from incident_index import IncidentIndex, INCIDENT_BROADCAST_ON_ESCALATION
+from structured_log import log
+from alert_webhook import AlertGroupStore, is_refiring, parse_webhook, render_group
+from workspaces import WorkspaceBusy
+
+# register() 시 설정되는 공유 컨텍스트
+context = None
+
+# 알림 전송 통계 (분 단위 링 버퍼)
+alert_stats = AlertStats()
+
+# 장애 키 → 최초 알림 메시지 인덱스 (관련 알림을 스레드 댓글로 묶음)
+incident_index = IncidentIndex()
+
+# Alertmanager/Grafana groupKey → 게시된 그룹 메시지
+alert_groups = AlertGroupStore()
+
+# 메시지가 삭제되는 등 chat.update 가 불가능할 때 새로 게시할 오류 코드
+UPDATE_FALLBACK_ERRORS = ("message_not_found", "cant_update_message", "edit_window_closed")
+
+# 스트리밍 로그 이상 탐지기 (첫 /logs 요청 시 생성)
+log_detector = None
+_log_detector_lock = threading.Lock()
+
+LOG_INGEST_BATCH = 1000
+
+HELP_TEXT = """📋 **장애 알림 명령어:**
+            • `stats [구간]` - 알림 전송 통계 (예: `stats 15m`)
+            • `24x7 전환` - 24x7 전환 요청 (관리자 승인 필요)
+
+            📋 **현재 구현된 기능:**
+            • Rater Bot 멘션 기능(관리자로 등록된 사용자가 \"승인합니다.\" 하였을때, 동작하는 Trigger - 현재 연결된 기능은 없음)
+            • 1회성 Log -> AI분석 -> 장애탐지 내용 및 분석 시나리오 Slack 알림 기능 (Slack 서버 실행, Log분석 실행시 동작)
+            • Flask 서버 구현 (Log 및 타 서비스에서 Slack서버로 요청 메세지 전송기능 API)
+            • 24x7 전환 : 해당 요청으로 Event Trigger 설정 해놓음(전환 동작 없음)"""
+
+
+def line_feed():
+    """라인피드 형식 반환"""
+    return "\n*************************************************************************************************\n"
+
+
+def warning_icon():
+    """경고 아이콘 반환"""
+    return ":alert:"
+
+
+def warning_message_format(message):
+    """장애 관제시 Slack Message 형식"""
+    return line_feed() + warning_icon() + message + line_feed()
+
+
+def deliver(channel_id, api_method, workspace=None, **kwargs):
+    """워크스페이스 전송 큐를 거쳐 Slack Web API 호출 (전송 통계/로그 기록) 후 (결과, 응답) 반환"""
+    workspace = workspace or context.default_workspace
+    started = time.perf_counter()
+    try:
+        response = workspace.call(api_method, channel=channel_id, **kwargs)
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        if response.get("ok"):
+            alert_stats.record_send(True, latency_ms)
+            log.info("alert", "sent", workspace=workspace.key, channel=channel_id, thread_ts=kwargs.get('thread_ts'),
+                     message_ts=kwargs.get('ts'), latency_ms=round(latency_ms, 1))
+            return "success", response
+        else:
+            alert_stats.record_send(False, latency_ms)
+            log.warning("alert", "send_failed", workspace=workspace.key, channel=channel_id, error=response.get('error'))
+            return "fail", response
+
+    except WorkspaceBusy:
+        # 해당 워크스페이스의 전송 큐가 가득 참 (다른 워크스페이스 전송에는 영향 없음)
+        log.warning("alert", "queue_full", workspace=workspace.key, channel=channel_id)
+        return "busy", None
+
+    except Exception as e:
+        alert_stats.record_send(False, (time.perf_counter() - started) * 1000)
+        log.error("alert", "send_error", workspace=workspace.key, channel=channel_id, error=str(e))
+        # SlackApiError 는 오류 코드 확인을 위해 응답을 함께 반환
+        return "fail", getattr(e, "response", None)
+
+
+def post_message(channel_id, message_text, thread_ts=None, reply_broadcast=False, format_text=True,
+                 workspace=None):
+    """Slack 메시지 전송 후 (결과, 응답) 반환 (format_text=False 면 본문을 그대로 전송)"""
+    if not format_text:
+        text = message_text
+    elif "정상" in message_text:
+        text = line_feed() + ":white_check_mark: 정상 동작 :white_check_mark:" + line_feed()
+    else:
+        text = warning_message_format(message_text)
+
+    return deliver(
+        channel_id,
+        "chat_postMessage",
+        workspace,
+        text=text,
+        thread_ts=thread_ts,
+        reply_broadcast=reply_broadcast if thread_ts else None
+    )
+
+
+def update_message(channel_id, ts, message_text, workspace=None):
+    """게시된 Slack 메시지 본문 교체 (chat.update) 후 (결과, 응답) 반환"""
+    return deliver(channel_id, "chat_update", workspace, ts=ts, text=message_text)
+
+
+def send_message(channel_id, message_text, workspace=None):
+    """Slack 메시지 전송"""
+    result, _ = post_message(channel_id, message_text, workspace=workspace)
+    return result
+
+
+def send_alert(channel_id, message_text, labels=None, workspace=None):
+    """장애 알림 전송 (같은 장애의 후속 알림은 최초 메시지의 스레드 댓글로 전송)"""
+    workspace = workspace or context.default_workspace
+    labels = incident_index.extract_labels(message_text, labels)
+    key = incident_index.key_for(labels)
+    if key:
+        # 워크스페이스가 다르면 같은 라벨이어도 별도 장애로 취급
+        key = f"{workspace.key}|{key}"
+    severity = labels.get("severity")
+    if not key:
+        result, _ = post_message(channel_id, message_text, workspace=workspace)
+        return result
+
+    # 조회 → 게시 → 등록 사이에 같은 장애의 다른 알림이 끼어들면 최초 메시지가 여러 개 생기므로 키별로 직렬화
+    with incident_index.lock_for(key):
+        incident = incident_index.lookup(key)
+        if incident and incident["channel"] == channel_id:
+            # 심각도가 올라간 경우에만 채널에도 함께 게시
+            escalated = incident_index.touch(key, severity)
+            result, _ = post_message(
+                channel_id, message_text,
+                thread_ts=incident["ts"],
+                reply_broadcast=escalated and INCIDENT_BROADCAST_ON_ESCALATION,
+                workspace=workspace
+            )
+            return result
+
+        result, response = post_message(channel_id, message_text, workspace=workspace)
+        if result == "success":
+            incident_index.open(key, channel_id, response.get("ts"), severity)
+        return result
+
+
+def handle_log_anomaly(anomaly):
+    """로그 이상 탐지 시 Slack 알림 전송"""
+    from log_detector import anomaly_message_format
+    send_message(context.rater_channel, anomaly_message_format(anomaly))
+
+
+def get_log_detector():
+    """로그 이상 탐지기를 첫 사용 시점에 생성하여 반환"""
+    global log_detector
+    if log_detector is None:
+        with _log_detector_lock:
+            if log_detector is None:
+                from log_detector import LogAnomalyDetector
+                log_detector = LogAnomalyDetector(on_anomaly=handle_log_anomaly)
+    return log_detector
+
+
+def detect():
+    """장애 감지 API 엔드포인트"""
+    alert_stats.record_request()
+    try:
+        data = request.get_json()
+        if not data or 'data' not in data:
+            return {"status": "error", "message": "Invalid request data"}, 400
+
+        # 워크스페이스 key 는 본문 'workspace' 또는 ?workspace= 로 지정 (미지정 시 기본 워크스페이스)
+        workspace = context.workspace(data.get('workspace') or request.args.get('workspace'))
+        if workspace is None:
+            return {"status": "error", "message": "Unknown workspace"}, 404
+
+        answer = data['data']
+        result = send_alert(workspace.rater_channel, answer, data.get('labels'), workspace)
+        if result == "busy":
+            return {"status": "busy", "workspace": workspace.key}, 429
+
+        return {"status": result}
+
+    except Exception as e:
+        log.error("detect", "request_error", error=str(e))
+        return {"status": "error", "message": str(e)}, 500
+
+
+def receive_alert_webhook():
+    """Alertmanager/Grafana 웹훅 수신 API (그룹당 Slack 메시지 1건을 게시 후 제자리 갱신)"""
+    alert_stats.record_request()
+    try:
+        group = parse_webhook(request.get_json(silent=True))
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}, 400
+
+    workspace = context.workspace(request.args.get('workspace'))
+    if workspace is None:
+        return {"status": "error", "message": "Unknown workspace"}, 404
+
+    try:
+        channel = request.args.get('channel') or workspace.rater_channel
+        group_key = f"{workspace.key}|{group['group_key']}"
+        statuses = {alert["fingerprint"]: alert["status"] for alert in group["alerts"]}
+
+        with alert_groups.lock_for(group_key):
+            state = alert_groups.get(group_key)
+            same_channel = state is not None and state["channel"] == channel
+            text = render_group(group, state["statuses"] if same_channel else {})
+
+            # 이미 게시된 그룹이면 제자리 갱신, 원본이 삭제됐거나 해결된 그룹이 다시 발생한 경우에는 새로 게시
+            repost = not same_channel or is_refiring(group, state["statuses"])
+            if not repost:
+                ts = state["ts"]
+                result, response = update_message(channel, ts, text, workspace)
+                repost = result != "success" and (response or {}).get("error") in UPDATE_FALLBACK_ERRORS
+            if repost:
+                result, response = post_message(channel, text, format_text=False, workspace=workspace)
+                ts = response.get("ts") if result == "success" else None
+
+            if result == "success":
+                alert_groups.put(group_key, channel, ts, statuses)
+
+        if result == "busy":
+            return {"status": "busy", "workspace": workspace.key}, 429
+        return {"status": result, "group_key": group["group_key"], "alerts": len(group["alerts"])}
+
+    except Exception as e:
+        log.error("webhook", "request_error", error=str(e))
+        return {"status": "error", "message": str(e)}, 500
+
+
+def ingest_logs():
+    """스트리밍 로그 수집 API 엔드포인트 (줄 단위 텍스트)"""
+    try:
+        detector = get_log_detector()
+        lines = 0
+        anomalies = 0
+        batch = []
+        # 요청 본문 전체를 메모리에 올리지 않고 줄 단위로 읽어 배치 처리
+        for raw in request.stream:
+            batch.append(raw.decode('utf-8', errors='replace'))
+            if len(batch) >= LOG_INGEST_BATCH:
+                anomalies += len(detector.ingest(batch))
+                lines += len(batch)
+                batch = []
+        if batch:
+            anomalies += len(detector.ingest(batch))
+            lines += len(batch)
+
+        return {"status": "success", "lines": lines, "anomalies": anomalies}
+
+    except Exception as e:
+        log.error("logs", "ingest_error", error=str(e))
+        return {"status": "error", "message": str(e)}, 500
+
+
+def stats():
+    """알림 통계 조회 API 엔드포인트 (?window=15m|2h|1d)"""
+    window = parse_window(request.args.get('window'))
+    if window is None:
+        return {"status": "error", "message": "Invalid window"}, 400
+    return alert_stats.summary(window)
+
+
+def handle_24x7_message(message, say):
+    """24x7 전환 메세지"""
+    say("24x7으로 전환하시겠습니까? \n관리자의 승인이 필요합니다.\n\n관리자는 \"승인합니다.\"를 입력해 주세요.")
+
+
+def handle_stats_message(message, say):
+    """알림 전송 통계 조회 (stats [window])"""
+    parts = message.get('text', '').split()
+    window = parse_window(parts[1] if len(parts) > 1 else None)
+    if window is None:
+        say("⚠️ 조회 구간 형식이 올바르지 않습니다. 예) `stats`, `stats 15m`, `stats 2h`, `stats 1d`")
+        return
+    say(stats_message_format(alert_stats.summary(window)))
+
+
+def handle_mention(event, say, client):
+    """멘션 사용으로 메세지 전달"""
+    text = event['text']
+    log.info("mention", "received", text=text)
+    # "Rater봇" 키워드 확인
+    if "승인" in text:
+        # 멘션 부분 제거하고 명령어 추출
+        user_id = event['user']
+        # 이벤트가 온 워크스페이스의 토큰으로 사용자 조회
+        workspace = context.workspace_for_token(client.token)
+        directory = workspace.directory if workspace else context.directory
+        user_name = directory.display_name(user_id) if directory else user_id
+        log.info("mention", "approval_requested", user=user_id, user_name=user_name)
+        if user_id == "U08JGPE0ACD":
+            say(" :ok_hand:알겠습니다.\n :white_check_mark:요청하신 동작을 수행하겠습니다.")
+        else:
+            say(":alert: 관리자만 승인할 수 있습니다. :alert:")
+
+
+def run_stats_digest():
+    """주기적으로 알림 통계 요약을 RATER_CHANNEL에 전송"""
+    window = max(STATS_DIGEST_INTERVAL // 60, 1)
+    while True:
+        time.sleep(STATS_DIGEST_INTERVAL)
+        # HA 모드에서는 리더만 정기 요약 전송
+        if not context.is_leader():
+            continue
+        try:
+            context.slack_client.chat_postMessage(
+                channel=context.rater_channel,
+                text=stats_message_format(alert_stats.summary(window), title="정기 알림 통계")
+            )
+        except Exception as e:
+            log.error("stats", "digest_error", error=str(e))
+
+
+def register(ctx):
+    """장애 알림 플러그인 등록"""
+    global context
+    context = ctx
+
+    ctx.flask_app.add_url_rule('/detect', view_func=detect, methods=['POST'])
+    ctx.flask_app.add_url_rule('/logs', view_func=ingest_logs, methods=['POST'])
+    ctx.flask_app.add_url_rule('/webhook/alerts', view_func=receive_alert_webhook, methods=['POST'])
+    ctx.flask_app.add_url_rule('/stats', view_func=stats, methods=['GET'])
+    ctx.add_endpoint("POST", "/detect", "장애 감지 메시지 전송")
+    ctx.add_endpoint("POST", "/logs", "스트리밍 로그 수집 및 이상 탐지")
+    ctx.add_endpoint("POST", "/webhook/alerts", "Alertmanager/Grafana 그룹 알림 수신")
+    ctx.add_endpoint("GET", "/stats", "알림 전송 통계")
+
+    ctx.slack_server.message("24x7 전환")(handle_24x7_message)
+    ctx.slack_server.message("stats")(handle_stats_message)
+    ctx.slack_server.event("app_mention")(handle_mention)
+    ctx.add_help(HELP_TEXT)
+
+    # 장애 인덱스 복원 및 주기적 스냅샷 저장
+    restored = incident_index.load()
+    if restored:
+        log.info("incident", "index_restored", incidents=restored)
+    ctx.add_background_task("IncidentSnapshotThread", incident_index.snapshot_loop)
+    atexit.register(incident_index.save)
+
+    # 정기 통계 요약 스레드 (STATS_DIGEST_INTERVAL=0 이면 비활성화)
+    if STATS_DIGEST_INTERVAL > 0 and ctx.rater_channel:
+        ctx.add_background_task("StatsDigestThread", run_stats_digest)
@@ -0,0 +1,185 @@
+import os
+import time
+
+from flask import request
+
+# register() 시 설정되는 공유 컨텍스트
+context = None
+
+# 환경 전환 스크립트 경로
+ENV_SWITCH_SCRIPT = os.environ.get("ENV_SWITCH_SCRIPT", "/app/prd-pm-exchange.sh")
+
+HELP_TEXT = """📋 **ArgoCD 환경 전환 명령어:**
+            • `pm` - 🔄 PM 환경으로 전환
+            • `prd` - 🚀 PRD 환경으로 전환
+
+            ⚠️ **주의사항:**
+            - 환경 전환은 약 1-2분 소요됩니다
+            - 환경 전환 시 ApplicationSet이 업데이트되고 앱들이 재배포됩니다
+            - 한 번에 하나의 환경만 활성화됩니다
+
+            🔧 **전환 과정:**
+            1. Git 저장소 클론
+            2. ApplicationSet YAML 파일 수정 (yq 사용)
+            3. 변경사항 커밋 및 푸시
+            4. ArgoCD ApplicationSet 동기화"""
+
+
+def execute_env_switch(environment, fencing_token=None):
+    """환경 전환 스크립트 실행 (HA 모드에서는 리더의 펜싱 토큰이 유효할 때만 실행)"""
+    # subprocess 는 환경 전환 요청 시에만 로드
+    import subprocess
+
+    leader = context.leader if context else None
+    if leader is not None and not leader.validate(fencing_token):
+        return {
+            "success": False,
+            "message": "리더 권한이 없어 환경 전환을 수행하지 않았습니다",
+            "environment": environment.upper()
+        }
+
+    # 스크립트가 gitops 저장소에 기록된 마지막 토큰과 비교하여 이전 리더의 전환을 거부
+    env = dict(os.environ)
+    if fencing_token is not None:
+        env["FENCING_TOKEN"] = str(fencing_token)
+
+    try:
+        # 스크립트 실행
+        result = subprocess.run(
+            [ENV_SWITCH_SCRIPT, environment],
+            capture_output=True,
+            text=True,
+            env=env,
+            timeout=300  # 5분 타임아웃
+        )
+
+        if result.returncode == 0:
+            return {
+                "success": True,
+                "message": f"환경 전환 성공: {environment.upper()}",
+                "output": result.stdout,
+                "environment": environment.upper()
+            }
+        else:
+            return {
+                "success": False,
+                "message": f"환경 전환 실패: {environment.upper()}",
+                "error": result.stderr,
+                "environment": environment.upper()
+            }
+
+    except subprocess.TimeoutExpired:
+        return {
+            "success": False,
+            "message": "환경 전환 타임아웃 (5분 초과)",
+            "environment": environment.upper()
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"환경 전환 스크립트 실행 오류: {str(e)}",
+            "environment": environment.upper()
+        }
+
+
+def current_fencing_token():
+    """리더의 현재 펜싱 토큰 반환 (단일 실행 시 None)"""
+    return context.leader.token if context.leader else None
+
+
+def handle_pm_message(message, say):
+    """PM 환경으로 전환"""
+    # HA 모드에서는 리더만 명령어 처리
+    if not context.is_leader():
+        return
+    user_id = message.get('user', '')
+
+    say("🔄 PM 환경으로 전환 중입니다... 잠시만 기다려주세요!")
+
+    # PM 환경 전환 실행
+    result = execute_env_switch("pm", current_fencing_token())
+
+    if result["success"]:
+        say(f"""🎉 **PM 환경 전환 완료!**
+
+✅ {result['message']}
+🏷️ 현재 환경: **{result['environment']}**
+🕐 전환 시각: {time.strftime('%Y-%m-%d %H:%M:%S')}
+👤 요청자: <@{user_id}>
+
+✅ PM 환경이 활성화되었습니다!""")
+    else:
+        say(f"""❌ **PM 환경 전환 실패**
+
+🔥 오류: {result['message']}
+👤 요청자: <@{user_id}>
+🕐 실패 시각: {time.strftime('%Y-%m-%d %H:%M:%S')}
+
+⚠️ 환경 전환에 실패했습니다. 관리자에게 문의하세요.""")
+
+
+def handle_prd_message(message, say):
+    """PRD 환경으로 전환"""
+    # HA 모드에서는 리더만 명령어 처리
+    if not context.is_leader():
+        return
+    user_id = message.get('user', '')
+
+    say("🚀 PRD 환경으로 전환 중입니다... 잠시만 기다려주세요!")
+
+    # PRD 환경 전환 실행
+    result = execute_env_switch("prd", current_fencing_token())
+
+    if result["success"]:
+        say(f"""🎉 **PRD 환경 전환 완료!**
+
+✅ {result['message']}
+🏷️ 현재 환경: **{result['environment']}**
+🕐 전환 시각: {time.strftime('%Y-%m-%d %H:%M:%S')}
+👤 요청자: <@{user_id}>
+
+🚀 PRD 환경이 활성화되었습니다!""")
+    else:
+        say(f"""❌ **PRD 환경 전환 실패**
+
+🔥 오류: {result['message']}
+👤 요청자: <@{user_id}>
+🕐 실패 시각: {time.strftime('%Y-%m-%d %H:%M:%S')}
+
+⚠️ 환경 전환에 실패했습니다. 관리자에게 문의하세요.""")
+
+
+def switch_environment():
+    """외부에서 환경 전환을 트리거하는 API"""
+    try:
+        data = request.get_json() or {}
+        env = data.get('environment', '').lower()
+
+        if env not in ['pm', 'prd']:
+            return {"error": "Invalid environment. Use 'pm' or 'prd'"}, 400
+
+        if not context.is_leader():
+            return {"status": "error", "message": "Not leader", "role": context.role()}, 409
+
+        result = execute_env_switch(env, current_fencing_token())
+
+        if result['success']:
+            return {"status": "success", "result": result}
+        else:
+            return {"status": "error", "message": result['message'], "details": result}, 500
+
+    except Exception as e:
+        return {"status": "error", "message": str(e)}, 500
+
+
+def register(ctx):
+    """ArgoCD 환경 전환 플러그인 등록"""
+    global context
+    context = ctx
+
+    ctx.flask_app.add_url_rule('/switch-env', view_func=switch_environment, methods=['POST'])
+    ctx.add_endpoint("POST", "/switch-env", "PM/PRD 환경 전환")
+
+    ctx.slack_server.message("pm")(handle_pm_message)
+    ctx.slack_server.message("prd")(handle_prd_message)
+    ctx.add_help(HELP_TEXT)
@@ -0,0 +1,146 @@
+import time
+
+from structured_log import log
+
+# register() 시 설정되는 공유 컨텍스트
+context = None
+
+HELP_TEXT = """📋 **기본 명령어:**
+            • `hello` - 인사말
+            • `ping` - 연결 테스트
+            • `status` - 서버 상태
+            • `health` - Flask 상태 확인
+            • `flask` - Flask 명령어 도움말"""
+
+
+def health_check():
+    """헬스 체크 엔드포인트"""
+    started = context.flask_start_time
+    uptime = int(time.time() - started) if started else 0
+    return {
+        "status": "healthy",
+        "message": "Flask server is running",
+        "uptime_seconds": uptime,
+        "role": context.role(),
+        "log": log.stats(),
+        "workspaces": {key: workspace.stats() for key, workspace in context.workspaces.items()},
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def readiness_check():
+    """Readiness 엔드포인트 (warm-up 완료 전에는 503)"""
+    if not context.ready:
+        return {"status": "warming_up"}, 503
+    return {"status": "ready"}
+
+
+def check_flask_health():
+    """Flask 서버 상태 확인 함수"""
+    # requests 는 health 명령어 사용 시에만 로드
+    import requests
+
+    try:
+        response = requests.get("http://localhost:5000/health", timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+            uptime_minutes = data.get('uptime_seconds', 0) // 60
+            return {
+                "status": "healthy",
+                "uptime_minutes": uptime_minutes,
+                "timestamp": data.get('timestamp', 'Unknown')
+            }
+        else:
+            return {"status": "unhealthy", "error": f"HTTP {response.status_code}"}
+    except requests.exceptions.ConnectionError:
+        return {"status": "down", "error": "Connection refused - Flask 서버가 실행되지 않음"}
+    except requests.exceptions.Timeout:
+        return {"status": "timeout", "error": "응답 시간 초과"}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+def handle_hello_message(message, say):
+    """hello 메시지에 대한 응답"""
+    say(f"Hey there <@{message['user']}>!")
+
+
+def handle_ping_message(message, say):
+    """ping 메시지에 대한 응답"""
+    say("pong! 🏓")
+
+
+def handle_status_message(message, say):
+    """상태 확인 메시지에 대한 응답"""
+    say("SLACK 서버가 정상 동작 중입니다! ✅")
+
+
+def handle_health_message(message, say):
+    """Flask 서버 헬스 체크"""
+    say("🔍 Flask 서버 상태를 확인 중...")
+
+    health_status = check_flask_health()
+
+    if health_status["status"] == "healthy":
+        uptime_minutes = health_status.get("uptime_minutes", 0)
+        timestamp = health_status.get("timestamp", "Unknown")
+
+        say(f"""✅ **Flask 서버 상태: 정상**
+            📊 가동 시간: {uptime_minutes}분
+            🕐 마지막 확인: {timestamp}
+            🌐 엔드포인트: http://localhost:5000""")
+
+    elif health_status["status"] == "down":
+        say(f"""❌ **Flask 서버 상태: 중단됨**
+            🔥 오류: {health_status.get('error', 'Unknown error')}
+            💡 Flask 서버를 다시 시작해주세요""")
+
+    elif health_status["status"] == "timeout":
+        say(f"""⏰ **Flask 서버 상태: 응답 지연**
+            🔥 오류: {health_status.get('error', 'Unknown error')}
+            💡 서버가 과부하 상태일 수 있습니다""")
+
+    else:
+        say(f"""⚠️ **Flask 서버 상태: 오류**
+            🔥 오류: {health_status.get('error', 'Unknown error')}
+            💡 서버 로그를 확인해주세요""")
+
+
+def handle_flask_command(message, say):
+    """Flask 관련 명령어 도움말"""
+    endpoints = "\n".join(
+        f"            • {method} `{path}` - {description}"
+        for method, path, description in context.endpoints
+    )
+    help_text = f"""🤖 **Flask 서버 관리 명령어**
+
+            📋 **사용 가능한 명령어:**
+            • `health` - Flask 서버 상태 확인
+            • `flask` - 이 도움말 표시
+            • `status` - 전체 서버 상태
+            • `ping` - 연결 테스트
+
+            🔗 **Flask API 엔드포인트:**
+{endpoints}
+
+            💡 **사용법:** 채팅에서 위 명령어를 입력하세요!"""
+
+    say(help_text)
+
+
+def register(ctx):
+    """헬스 체크 플러그인 등록"""
+    global context
+    context = ctx
+
+    ctx.flask_app.add_url_rule('/health', view_func=health_check, methods=['GET'])
+    ctx.flask_app.add_url_rule('/ready', view_func=readiness_check, methods=['GET'])
+    ctx.add_endpoint("GET", "/health", "헬스 체크")
+    ctx.add_endpoint("GET", "/ready", "Warm-up 완료 여부")
+
+    ctx.slack_server.message("hello")(handle_hello_message)
+    ctx.slack_server.message("ping")(handle_ping_message)
+    ctx.slack_server.message("status")(handle_status_message)
+    ctx.slack_server.message("health")(handle_health_message)
+    ctx.slack_server.message("flask")(handle_flask_command)
+    ctx.add_help(HELP_TEXT)
@@ -38,10 +38,24 @@ fi
 cd k-rater-uq-gitops
 
 git pull || exit_with_error
+
+# HA 모드 펜싱: gitops 저장소에 마지막 펜싱 토큰을 기록하고, 더 작은 토큰(이전 리더)의 전환은 거부
+# push 는 fast-forward 만 허용되므로 새 리더가 먼저 push 한 경우 이전 리더의 push 는 거절됨
+FENCING_FILE=.fencing-token
+if [ -n "$FENCING_TOKEN" ]; then
+    last_token=$(cat "$FENCING_FILE" 2>/dev/null || echo 0)
+    if [ "$FENCING_TOKEN" -lt "$last_token" ]; then
+        echo "펜싱 토큰이 오래되었습니다 (현재: $FENCING_TOKEN, 저장소: $last_token). 전환을 중단합니다."
+        exit_with_error
+    fi
+    echo "$FENCING_TOKEN" > "$FENCING_FILE"
+    git add "$FENCING_FILE" || exit_with_error
+fi
+
 if [ "$var1" = "pm" ]; then
-    git commit -a -m 'pm 전환'
+    git commit -a -m "pm 전환${FENCING_TOKEN:+ (fencing token: $FENCING_TOKEN)}"
 elif [ "$var1" = "prd" ]; then
-    git commit -a -m 'prd 전환'
+    git commit -a -m "prd 전환${FENCING_TOKEN:+ (fencing token: $FENCING_TOKEN)}"
 fi
 git push || exit_with_error
 
@@ -0,0 +1,187 @@
+import argparse
+import json
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from fake_slack_api import FakeSlackServer
+from traffic_recorder import load_recording
+
+
+def percentile(sorted_values, quantile):
+    """정렬된 목록에서 nearest-rank 분위수 반환"""
+    if not sorted_values:
+        return None
+    index = min(int(quantile * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(results, elapsed):
+    """재생 결과를 종류별 처리량/지연 시간/오류 수로 요약"""
+    report = {
+        "total": len(results),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+        "errors": sum(1 for _, _, ok in results if not ok),
+        "kinds": {},
+    }
+    for kind in sorted({kind for kind, _, _ in results}):
+        latencies = sorted(latency for k, latency, _ in results if k == kind)
+        report["kinds"][kind] = {
+            "count": len(latencies),
+            "errors": sum(1 for k, _, ok in results if k == kind and not ok),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        }
+    return report
+
+
+class Replayer:
+    """기록된 트래픽을 slack_server / flask_app 에 직접 주입"""
+
+    def __init__(self, server):
+        from slack_bolt.request import BoltRequest
+        self.server = server
+        self.bolt_request = BoltRequest
+        # process_before_response 로 리스너가 재생 스레드에서 실행되므로 스레드별로 리스너 오류 기록
+        self._local = threading.local()
+
+        def record_listener_error(error):
+            self._local.error = error
+
+        server.slack_server.error(record_listener_error)
+
+    def drive(self, record):
+        """기록 한 건 재생 후 (종류, 지연 시간, 성공 여부) 반환"""
+        kind = record["kind"]
+        started = time.perf_counter()
+        try:
+            if kind == "detect":
+                response = self.server.flask_app.test_client().post(
+                    "/detect", json=record["payload"], query_string=record.get("query")
+                )
+                ok = response.status_code < 400 and (response.get_json() or {}).get("status") == "success"
+            else:
+                self._local.error = None
+                response = self.server.slack_server.dispatch(
+                    self.bolt_request(body=record["payload"], mode="socket_mode"),
+                    workspace=record.get("workspace")
+                )
+                ok = response.status < 400 and self._local.error is None
+                if self._local.error is not None:
+                    print(f"리스너 오류 ({kind}): {self._local.error}", file=sys.stderr)
+        except Exception as e:
+            print(f"재생 중 오류 ({kind}): {e}", file=sys.stderr)
+            ok = False
+        return kind, time.perf_counter() - started, ok
+
+    def run(self, records, speed=1.0, workers=8):
+        """기록된 상대 시각을 speed 배속으로 재현하며 재생 (speed=0 이면 최대 속도)"""
+        futures = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for record in records:
+                if speed > 0:
+                    delay = started + record["t"] / speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                futures.append(executor.submit(self.drive, record))
+            results = [future.result() for future in futures]
+        return results, time.perf_counter() - started
+
+
+def recorded_workspaces(records):
+    """기록에 등장하는 워크스페이스 key 목록 (처음 등장한 순서)"""
+    keys = []
+    for record in records:
+        key = record.get("workspace")
+        if record["kind"] == "detect":
+            payload = record.get("payload")
+            key = (payload.get("workspace") if isinstance(payload, dict) else None) \
+                or parse_qs(record.get("query") or "").get("workspace", [None])[0]
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def load_server(base_url, workspace_keys=()):
+    """가짜 Slack API를 바라보도록 환경 변수를 설정한 뒤 SlackServerApp 로드
+
+    workspace_keys 에 기본 워크스페이스 외의 key 가 있으면 (WORKSPACES_CONFIG 미지정 시)
+    같은 key 의 재생용 워크스페이스 설정을 만들어 기록된 워크스페이스별로 재생
+    """
+    os.environ.update({
+        "SLACK_BOT_TOKEN": "xoxb-replay",
+        "SLACK_SIGNING_SECRET": "replay",
+        "SLACK_APP_TOKEN": "xapp-replay",
+        "SLACK_API_BASE_URL": base_url,
+    })
+    os.environ.setdefault("RATER_CHANNEL", "C0REPLAY")
+    # 서버 처리 성능을 재려는 것이므로 워크스페이스 속도 제한은 기본 비활성화
+    os.environ.setdefault("WORKSPACE_RATE_LIMIT", "0")
+    # ack 시간이 아닌 리스너 실행 완료까지의 지연과 리스너 오류를 측정
+    os.environ["SLACK_PROCESS_BEFORE_RESPONSE"] = "true"
+    os.environ.pop("TRAFFIC_RECORD_PATH", None)
+    # 운영 장애 스냅샷(config/incidents.json)을 읽거나 덮어쓰지 않도록 임시 경로 사용
+    # (atexit 는 역순 실행이므로 종료 시 스냅샷 저장 후 디렉터리 삭제)
+    snapshot_dir = tempfile.mkdtemp(prefix="replay-")
+    atexit.register(shutil.rmtree, snapshot_dir, ignore_errors=True)
+    os.environ["INCIDENT_SNAPSHOT_PATH"] = os.path.join(snapshot_dir, "incidents.json")
+    if set(workspace_keys) - {os.environ.get("DEFAULT_WORKSPACE", "default")} \
+            and not os.environ.get("WORKSPACES_CONFIG"):
+        config_path = os.path.join(snapshot_dir, "workspaces.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({
+                key: {
+                    "bot_token": f"xoxb-replay-{key}",
+                    "signing_secret": "replay",
+                    "app_token": f"xapp-replay-{key}",
+                    "rater_channel": os.environ["RATER_CHANNEL"],
+                }
+                for key in workspace_keys
+            }, f)
+        os.environ["WORKSPACES_CONFIG"] = config_path
+    # 서버 로그는 stderr 로 보내 stdout 에는 결과 JSON 만 출력
+    from structured_log import log
+    log.stream = sys.stderr
+    import SlackServerApp
+    return SlackServerApp
+
+
+def main():
+    """트래픽 재생 실행 함수"""
+    parser = argparse.ArgumentParser(description="Socket Mode / /detect 트래픽 재생 도구")
+    parser.add_argument("recording", help="TRAFFIC_RECORD_PATH 로 기록한 파일")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (0: 최대 속도)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--slack-latency", type=float, default=0.0, help="가짜 Slack API 응답 지연(초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    records = load_recording(args.recording)
+    fake_slack = FakeSlackServer(latency=args.slack_latency).start()
+    try:
+        server = load_server(fake_slack.base_url, recorded_workspaces(records))
+        results, elapsed = Replayer(server).run(records, speed=args.speed, workers=args.workers)
+    finally:
+        fake_slack.stop()
+
+    report = summarize(results, elapsed)
+    report["speed"] = args.speed
+    report["slack_api_calls"] = fake_slack.state.calls
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == '__main__':
+    main()
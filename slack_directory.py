@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+
+from structured_log import log
+
+# 채널/사용자 인덱스 설정 (환경 변수로 조정 가능)
+DIRECTORY_REFRESH_INTERVAL = int(os.environ.get("DIRECTORY_REFRESH_INTERVAL", "600"))
+USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", "3600"))
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "5000"))
+CHANNEL_PAGE_SIZE = 1000
+
+
+class SlackDirectory:
+    """채널 이름→ID, 사용자 ID→프로필 메모리 인덱스 (백그라운드 갱신)"""
+
+    def __init__(self, client, user_ttl=USER_CACHE_TTL, user_cache_size=USER_CACHE_SIZE):
+        self.client = client
+        self.user_ttl = user_ttl
+        self.user_cache_size = user_cache_size
+        self.channels = {}
+        self.users = {}
+        self.channels_loaded_at = None
+        self._lock = threading.Lock()
+
+    def refresh_channels(self):
+        """conversations.list 를 페이지 단위로 조회하여 채널 인덱스 재구축"""
+        channels = {}
+        cursor = None
+        try:
+            while True:
+                response = self.client.conversations_list(
+                    types="public_channel,private_channel",
+                    exclude_archived=True,
+                    limit=CHANNEL_PAGE_SIZE,
+                    cursor=cursor
+                )
+                for channel in response.get("channels", []):
+                    channels[channel["name"]] = channel["id"]
+                cursor = (response.get("response_metadata") or {}).get("next_cursor")
+                if not cursor:
+                    break
+        except Exception as e:
+            log.error("directory", "channel_list_error", error=str(e))
+            return False
+
+        # 조회가 끝난 뒤 한 번에 교체하여 조회 중에도 기존 인덱스 사용 가능
+        self.channels = channels
+        self.channels_loaded_at = time.time()
+        return True
+
+    def channel_id(self, name_or_id):
+        """'#alerts' / 'alerts' / 'C0123' 를 채널 ID 로 변환 (인덱스에 없으면 입력값 그대로 반환)"""
+        if not name_or_id:
+            return name_or_id
+        return self.channels.get(name_or_id.lstrip("#"), name_or_id)
+
+    def user_profile(self, user_id):
+        """사용자 프로필 반환 (캐시 만료 시에만 users.info 호출)"""
+        cached = self.users.get(user_id)
+        if cached and time.time() - cached[0] < self.user_ttl:
+            return cached[1]
+        return self._fetch_user(user_id) or (cached[1] if cached else None)
+
+    def display_name(self, user_id):
+        """멘션/로그 표시용 사용자 이름 반환"""
+        profile = self.user_profile(user_id) or {}
+        return profile.get("display_name") or profile.get("real_name") or user_id
+
+    def _fetch_user(self, user_id):
+        try:
+            user = self.client.users_info(user=user_id).get("user") or {}
+        except Exception as e:
+            log.error("directory", "user_info_error", user=user_id, error=str(e))
+            return None
+
+        profile = dict(user.get("profile") or {})
+        profile.setdefault("real_name", user.get("real_name") or user.get("name"))
+        with self._lock:
+            if user_id not in self.users and len(self.users) >= self.user_cache_size:
+                # 가장 오래 전에 갱신된 항목 제거
+                oldest = min(self.users, key=lambda key: self.users[key][0])
+                del self.users[oldest]
+            self.users[user_id] = (time.time(), profile)
+        return profile
+
+    def refresh_loop(self, interval=DIRECTORY_REFRESH_INTERVAL):
+        """채널 인덱스와 만료 임박 사용자 프로필을 주기적으로 갱신"""
+        while True:
+            time.sleep(interval)
+            self.refresh_channels()
+            deadline = time.time() - self.user_ttl + interval
+            for user_id, (fetched_at, _) in list(self.users.items()):
+                if fetched_at < deadline:
+                    self._fetch_user(user_id)
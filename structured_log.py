@@ -0,0 +1,158 @@
+import atexit
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+
+# 구조화 로그 설정 (환경 변수로 조정 가능)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_BUFFER_SIZE = int(os.environ.get("LOG_BUFFER_SIZE", "10000"))
+# 카테고리별 샘플링 비율 (예: "message=0.1,detect=1"), 지정하지 않은 카테고리는 1.0
+LOG_SAMPLE_RATES = os.environ.get("LOG_SAMPLE_RATES", "message=0.1")
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+WRITE_BATCH = 512
+# writer 스레드가 깨어난 뒤 로그를 모아서 쓰기 위해 기다리는 시간(초)
+WRITE_INTERVAL = 0.05
+
+
+def parse_sample_rates(text):
+    """'category=rate,...' 형식의 샘플링 설정 파싱"""
+    rates = {}
+    for item in text.split(","):
+        if "=" in item:
+            category, rate = item.split("=", 1)
+            rates[category.strip()] = float(rate)
+    return rates
+
+
+class AsyncJsonLogger:
+    """큐 기반 JSON 로거 (호출 스레드는 큐에 넣기만 하고 직렬화/출력은 백그라운드 스레드가 담당)"""
+
+    def __init__(self, stream=None, level=LOG_LEVEL, buffer_size=LOG_BUFFER_SIZE,
+                 sample_rates=LOG_SAMPLE_RATES):
+        self.stream = stream
+        self.level = LEVELS.get(level, 20)
+        self.sample_rates = parse_sample_rates(sample_rates) if isinstance(sample_rates, str) else dict(sample_rates)
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self.sampled_out = 0
+        # deque.append/popleft 는 GIL 하에서 원자적이므로 호출 경로에 락을 두지 않음
+        self._buffer = deque()
+        self._start_writer()
+        if hasattr(os, "register_at_fork"):
+            # fork(gunicorn --preload 등) 시 writer 스레드는 자식에 복제되지 않으므로 자식에서 새로 시작
+            # 출력 도중 fork 되어 자식의 스트림 락이 잠긴 채 남지 않도록 fork 동안 출력을 막음
+            os.register_at_fork(before=self._before_fork, after_in_parent=self._after_fork_in_parent,
+                                after_in_child=self._after_fork_in_child)
+
+    def _start_writer(self):
+        self._writing = False
+        self._write_lock = threading.Lock()
+        # 버퍼가 빈 동안 writer 스레드는 주기적으로 깨어나지 않고 다음 로그가 들어올 때까지 대기
+        self._wakeup = threading.Event()
+        self._writer = threading.Thread(target=self._write_loop, name="LogWriterThread", daemon=True)
+        self._writer.start()
+
+    def _before_fork(self):
+        self._write_lock.acquire()
+
+    def _after_fork_in_parent(self):
+        self._write_lock.release()
+
+    def _after_fork_in_child(self):
+        # 부모의 미출력 로그는 부모가 출력하므로 자식에서는 비우고 새 writer 시작
+        self._buffer.clear()
+        self.dropped = 0
+        self.sampled_out = 0
+        self._start_writer()
+
+    def _emit(self, level, category, event, fields):
+        """로그 한 건을 버퍼에 추가 (포맷팅은 writer 스레드에서 지연 수행)"""
+        rate = self.sample_rates.get(category)
+        if rate is not None and random.random() >= rate:
+            self.sampled_out += 1
+            return
+        if len(self._buffer) >= self.buffer_size:
+            # 출력이 밀려도 호출 경로를 막지 않도록 버리고 개수만 기록
+            self.dropped += 1
+            return
+        self._buffer.append((time.time(), level, category, event, fields))
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def log(self, level, category, event, **fields):
+        if LEVELS[level] >= self.level:
+            self._emit(level, category, event, fields)
+
+    def debug(self, category, event, **fields):
+        if self.level <= 10:
+            self._emit("DEBUG", category, event, fields)
+
+    def info(self, category, event, **fields):
+        if self.level <= 20:
+            self._emit("INFO", category, event, fields)
+
+    def warning(self, category, event, **fields):
+        if self.level <= 30:
+            self._emit("WARNING", category, event, fields)
+
+    def error(self, category, event, **fields):
+        self._emit("ERROR", category, event, fields)
+
+    def stats(self):
+        return {"queued": len(self._buffer), "dropped": self.dropped, "sampled_out": self.sampled_out}
+
+    def _format(self, record):
+        created, level, category, event, fields = record
+        payload = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(created)) + f".{int(created % 1 * 1000):03d}",
+            "level": level,
+            "category": category,
+            "event": event,
+        }
+        payload.update(fields)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+    def _write_loop(self):
+        buffer = self._buffer
+        wakeup = self._wakeup
+        while True:
+            wakeup.wait()
+            time.sleep(WRITE_INTERVAL)
+            # 버퍼를 비우기 전에 해제해야 그 사이 추가된 로그가 다음 깨우기를 놓치지 않음
+            wakeup.clear()
+            self._writing = True
+            while buffer:
+                batch = []
+                while buffer and len(batch) < WRITE_BATCH:
+                    batch.append(buffer.popleft())
+                with self._write_lock:
+                    self._write(batch)
+            self._writing = False
+
+    def _write(self, batch):
+        stream = self.stream or sys.stdout
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self._format(record))
+            except Exception as e:
+                lines.append(json.dumps({"level": "ERROR", "category": "log", "event": "format_error", "error": str(e)}))
+        if lines:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+
+    def flush(self, timeout=2.0):
+        """큐에 남은 로그가 출력될 때까지 대기 (종료 시 사용)"""
+        deadline = time.time() + timeout
+        while (self._buffer or self._writing) and time.time() < deadline:
+            time.sleep(0.01)
+
+
+# 프로세스 공용 로거
+log = AsyncJsonLogger()
+atexit.register(log.flush)
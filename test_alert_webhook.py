@@ -0,0 +1,126 @@
+import pytest
+
+import alert_webhook
+from alert_webhook import AlertGroupStore, is_refiring, parse_webhook, render_group
+
+
+def alertmanager_payload(statuses, group_key="{}:{alertname=\"HighCPU\"}"):
+    return {
+        "groupKey": group_key,
+        "status": "firing" if "firing" in statuses.values() else "resolved",
+        "groupLabels": {"alertname": "HighCPU"},
+        "commonLabels": {"alertname": "HighCPU", "severity": "critical"},
+        "externalURL": "http://alertmanager:9093",
+        "alerts": [
+            {
+                "fingerprint": fingerprint,
+                "status": status,
+                "labels": {"alertname": "HighCPU", "severity": "critical", "instance": fingerprint},
+                "annotations": {"summary": f"{fingerprint} CPU > 90%"},
+            }
+            for fingerprint, status in statuses.items()
+        ],
+    }
+
+
+def statuses_of(group):
+    return {alert["fingerprint"]: alert["status"] for alert in group["alerts"]}
+
+
+def test_parse_alertmanager_payload():
+    group = parse_webhook(alertmanager_payload({"a": "firing", "b": "resolved"}))
+    assert group["group_key"] == "{}:{alertname=\"HighCPU\"}"
+    assert group["status"] == "firing"
+    assert group["title"] == "HighCPU"
+    assert group["external_url"] == "http://alertmanager:9093"
+    assert group["alerts"][0] == {
+        "fingerprint": "a", "status": "firing", "name": "HighCPU", "severity": "critical",
+        "instance": "a", "summary": "a CPU > 90%",
+    }
+    assert group["alerts"][1]["status"] == "resolved"
+
+
+def test_parse_alertmanager_alert_without_fingerprint_uses_labels():
+    payload = alertmanager_payload({"a": "firing"})
+    del payload["alerts"][0]["fingerprint"]
+    first = parse_webhook(payload)["alerts"][0]["fingerprint"]
+    assert first == parse_webhook(payload)["alerts"][0]["fingerprint"]
+    assert first != "a"
+
+
+def test_parse_grafana_legacy_payload():
+    group = parse_webhook({
+        "ruleId": 7, "ruleName": "Disk usage", "state": "ok", "message": "disk ok",
+        "evalMatches": [{"metric": "sda"}, {"metric": "sdb"}], "tags": {"severity": "warning"},
+    })
+    assert group["group_key"] == "grafana:7"
+    assert group["status"] == "resolved"
+    assert group["alerts"][0]["instance"] == "sda, sdb"
+    assert group["alerts"][0]["severity"] == "warning"
+
+
+@pytest.mark.parametrize("payload", [None, [], {"foo": "bar"}])
+def test_parse_rejects_unknown_payload(payload):
+    with pytest.raises(ValueError):
+        parse_webhook(payload)
+
+
+def test_render_first_post_has_no_change_summary():
+    text = render_group(parse_webhook(alertmanager_payload({"a": "firing"})), {})
+    assert text.startswith("🔥 *[FIRING:1] HighCPU* (alertname=HighCPU)")
+    assert "변경 사항" not in text
+    assert "• 🆕 *HighCPU* [critical] a — a CPU > 90%" in text
+
+
+def test_render_marks_only_changed_alerts():
+    group = parse_webhook(alertmanager_payload({"a": "firing", "b": "firing", "c": "resolved"}))
+    text = render_group(group, {"a": "firing", "c": "firing"})
+    assert "신규 발생 1건 / 신규 해결 1건" in text
+    assert "• *HighCPU* [critical] a" in text
+    assert "• 🆕 *HighCPU* [critical] b" in text
+    assert "✅ 해결됨 (1)\n• 🆕 *HighCPU* [critical] c" in text
+
+
+def test_render_limits_listed_alerts(monkeypatch):
+    monkeypatch.setattr(alert_webhook, "WEBHOOK_MAX_LISTED", 2)
+    group = parse_webhook(alertmanager_payload({f"i{n}": "firing" for n in range(5)}))
+    text = render_group(group, {})
+    assert "🔥 발생 중 (5)" in text
+    assert "• … 외 3건" in text
+
+
+def test_all_resolved_group_firing_again_is_refiring():
+    firing = parse_webhook(alertmanager_payload({f"i{n}": "firing" for n in range(300)}))
+    resolved = parse_webhook(alertmanager_payload({f"i{n}": "resolved" for n in range(300)}))
+    refired = parse_webhook(alertmanager_payload({"i0": "firing"}))
+
+    assert not is_refiring(firing, {})
+    assert not is_refiring(resolved, statuses_of(firing))
+    assert is_refiring(refired, statuses_of(resolved))
+
+
+def test_partially_firing_group_is_updated_in_place():
+    previous = {"a": "firing", "b": "resolved"}
+    assert not is_refiring(parse_webhook(alertmanager_payload({"a": "firing", "b": "firing"})), previous)
+    assert not is_refiring(parse_webhook(alertmanager_payload({"a": "resolved"})), {"a": "resolved"})
+
+
+def test_group_store_expires_and_evicts_oldest():
+    now = [1000.0]
+    store = AlertGroupStore(ttl=60, max_groups=2, clock=lambda: now[0])
+    store.put("g1", "C1", "1.1", {"a": "firing"})
+    store.put("g2", "C1", "1.2", {})
+    store.put("g3", "C1", "1.3", {})
+    assert store.get("g1") is None
+    assert store.get("g2")["ts"] == "1.2"
+
+    now[0] += 61
+    assert store.get("g3") is None
+
+
+def test_group_store_lock_is_removed_after_use():
+    store = AlertGroupStore()
+    with store.lock_for("g1"):
+        with store.lock_for("g2"):
+            assert set(store._locks) == {"g1", "g2"}
+    assert store._locks == {}
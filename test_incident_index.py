@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+
+import pytest
+
+from incident_index import IncidentIndex
+
+
+class FakeClock:
+    """만료 시점 재현용 시계"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def index(tmp_path, clock):
+    return IncidentIndex(key_labels="service,error", ttl=60,
+                         snapshot_path=str(tmp_path / "incidents.json"), clock=clock)
+
+
+def test_labels_extracted_from_text_and_request_labels_take_precedence(index):
+    labels = index.extract_labels("service=api TimeoutError critical", {"service": "billing"})
+    assert labels == {"service": "billing", "error": "TimeoutError", "severity": "critical"}
+
+
+def test_key_is_case_insensitive_and_requires_all_key_labels(index):
+    assert index.key_for({"service": "API", "error": "TimeoutError"}) == "api|timeouterror"
+    assert index.key_for(index.extract_labels("service=api timeouterror")) == "api|timeouterror"
+    assert index.key_for({"service": "api"}) is None
+    assert index.key_for(index.extract_labels("disk almost full")) is None
+
+
+def test_lookup_returns_copy_until_expiry(index, clock):
+    index.open("api|timeouterror", "C1", "1.000001", "minor")
+    incident = index.lookup("api|timeouterror")
+    assert incident["ts"] == "1.000001" and incident["count"] == 1
+    incident["ts"] = "changed"
+    assert index.lookup("api|timeouterror")["ts"] == "1.000001"
+
+    clock.now += 61
+    assert index.lookup("api|timeouterror") is None
+    assert "api|timeouterror" not in index.incidents
+
+
+def test_touch_extends_expiry_and_counts_followups(index, clock):
+    index.open("api|timeouterror", "C1", "1.000001")
+    clock.now += 50
+    index.touch("api|timeouterror")
+    clock.now += 50
+    assert index.lookup("api|timeouterror")["count"] == 2
+    assert not index.touch("missing|key")
+
+
+def test_touch_reports_escalation_only_when_severity_rises(index):
+    index.open("api|timeouterror", "C1", "1.000001", "minor")
+    assert not index.touch("api|timeouterror", "warning")
+    assert not index.touch("api|timeouterror", None)
+    assert index.touch("api|timeouterror", "Critical")
+    assert not index.touch("api|timeouterror", "major")
+    assert index.lookup("api|timeouterror")["severity"] == "Critical"
+
+
+def test_snapshot_round_trip_drops_expired_entries(index, clock, tmp_path):
+    index.open("api|timeouterror", "C1", "1.000001", "major")
+    index.open("db|connectionerror", "C1", "1.000002")
+    clock.now += 30
+    index.touch("api|timeouterror")
+    assert index.save()
+    assert not index.save()
+
+    restored = IncidentIndex(key_labels="service,error", ttl=60,
+                             snapshot_path=index.snapshot_path, clock=clock)
+    clock.now += 40
+    assert restored.load() == 1
+    assert restored.lookup("api|timeouterror")["severity"] == "major"
+    assert restored.lookup("db|connectionerror") is None
+    assert [p.name for p in tmp_path.iterdir()] == ["incidents.json"]
+
+
+def test_load_ignores_missing_or_corrupt_snapshot(index):
+    assert index.load() == 0
+    with open(index.snapshot_path, "w", encoding="utf-8") as f:
+        f.write("{broken")
+    assert index.load() == 0
+    assert index.incidents == {}
+
+
+def test_save_writes_valid_json(index):
+    index.open("api|timeouterror", "C1", "1.000001")
+    index.save()
+    with open(index.snapshot_path, encoding="utf-8") as f:
+        assert set(json.load(f)) == {"api|timeouterror"}
+
+
+def test_lock_for_serializes_same_key_and_is_removed_after_use(index):
+    posted = []
+
+    def alert():
+        with index.lock_for("api|timeouterror"):
+            if index.lookup("api|timeouterror") is None:
+                time.sleep(0.01)
+                posted.append(True)
+                index.open("api|timeouterror", "C1", "1.000001")
+            else:
+                index.touch("api|timeouterror")
+
+    threads = [threading.Thread(target=alert) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(posted) == 1
+    assert index.lookup("api|timeouterror")["count"] == 10
+    assert index._locks == {}
@@ -0,0 +1,151 @@
+import os
+import subprocess
+import time
+
+import pytest
+
+from leader_election import LeaderElector, SqliteLeaseStore
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prd-pm-exchange.sh")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SqliteLeaseStore(str(tmp_path / "leader.db"))
+
+
+class FailingStore:
+    """임대 저장소 장애 재현용"""
+
+    def try_acquire(self, name, holder, ttl):
+        raise OSError("store unavailable")
+
+
+def test_first_holder_acquires_and_renews_with_same_token(store):
+    assert store.try_acquire("lease", "a", 10) == 1
+    assert store.try_acquire("lease", "a", 10) == 1
+    assert store.current("lease")["holder"] == "a"
+
+
+def test_other_holder_blocked_while_lease_valid(store):
+    store.try_acquire("lease", "a", 10)
+    assert store.try_acquire("lease", "b", 10) is None
+
+
+def test_expired_lease_taken_over_with_higher_token(store):
+    store.try_acquire("lease", "a", 0.05)
+    time.sleep(0.1)
+    assert store.try_acquire("lease", "b", 10) == 2
+    assert not store.validate("lease", 1)
+    assert store.validate("lease", 2)
+
+
+def test_release_allows_immediate_takeover(store):
+    store.try_acquire("lease", "a", 10)
+    store.release("lease", "a")
+    assert store.try_acquire("lease", "b", 10) == 2
+
+
+def test_release_by_non_holder_is_ignored(store):
+    store.try_acquire("lease", "a", 10)
+    store.release("lease", "b")
+    assert store.try_acquire("lease", "b", 10) is None
+
+
+def test_elector_calls_back_on_election_and_revocation(store):
+    events = []
+    elector = LeaderElector(store, name="lease", holder="a", ttl=0.05,
+                            on_elected=lambda: events.append("elected"),
+                            on_revoked=lambda: events.append("revoked"))
+    elector.step()
+    assert elector.is_leader() and elector.token == 1
+
+    # 갱신하지 못한 사이 다른 복제본이 임대를 인수
+    time.sleep(0.1)
+    assert store.try_acquire("lease", "b", 10) == 2
+    elector.step()
+
+    assert events == ["elected", "revoked"]
+    assert not elector.is_leader()
+    assert not elector.validate(1)
+
+
+def test_elector_stops_leading_after_safety_window(store):
+    elector = LeaderElector(store, name="lease", holder="a", ttl=0.05)
+    elector.step()
+    assert elector.is_leader()
+    time.sleep(0.05)
+    # 임대 만료 전(TTL 의 80%)에 스스로 리더가 아님으로 판단
+    assert not elector.is_leader()
+
+
+def test_elector_keeps_leadership_on_store_error_within_safety_window(store):
+    revoked = []
+    elector = LeaderElector(store, name="lease", holder="a", ttl=10, on_revoked=lambda: revoked.append(True))
+    elector.step()
+    elector.store = FailingStore()
+    elector.step()
+    assert elector.is_leader() and not revoked
+
+    elector.valid_until = 0
+    elector.step()
+    assert revoked and elector.token is None
+
+
+def test_stop_releases_lease(store):
+    elector = LeaderElector(store, name="lease", holder="a", ttl=10)
+    elector.step()
+    elector.stop()
+    assert elector.token is None
+    assert store.try_acquire("lease", "b", 10) == 2
+
+
+def test_validate_rejects_token_of_previous_term(store):
+    elector = LeaderElector(store, name="lease", holder="a", ttl=10)
+    elector.step()
+    assert elector.validate(1)
+    assert not elector.validate(2)
+    assert not elector.validate(None)
+
+
+def test_env_switch_refuses_stale_fencing_token(store, monkeypatch):
+    from plugins import PluginContext, env_switch
+
+    elector = LeaderElector(store, name="lease", holder="a", ttl=10)
+    elector.step()
+    ctx = PluginContext(slack_server=None, slack_client=None, flask_app=None)
+    ctx.leader = elector
+    monkeypatch.setattr(env_switch, "context", ctx)
+    monkeypatch.setattr(env_switch, "ENV_SWITCH_SCRIPT", "/nonexistent/script.sh")
+
+    result = env_switch.execute_env_switch("pm", fencing_token=0)
+    assert not result["success"]
+    assert "리더 권한" in result["message"]
+
+
+def _fencing_check_script(tmp_path):
+    """prd-pm-exchange.sh 의 펜싱 구간만 잘라 로컬 git 저장소에서 실행할 수 있는 스크립트 생성"""
+    with open(SCRIPT, encoding="utf-8") as f:
+        source = f.read()
+    start = source.index("FENCING_FILE=")
+    end = source.index("\nfi\n", start) + len("\nfi\n")
+    path = tmp_path / "fencing_check.sh"
+    path.write_text("exit_with_error() { exit 1; }\n" + source[start:end] + "exit 0\n")
+    return str(path)
+
+
+def test_gitops_script_rejects_lower_fencing_token(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    (repo / ".fencing-token").write_text("5\n")
+    script = _fencing_check_script(tmp_path)
+
+    def run(token):
+        env = dict(os.environ, FENCING_TOKEN=str(token))
+        return subprocess.run(["bash", script], cwd=repo, env=env, capture_output=True).returncode
+
+    assert run(4) != 0
+    assert (repo / ".fencing-token").read_text().strip() == "5"
+    assert run(6) == 0
+    assert (repo / ".fencing-token").read_text().strip() == "6"
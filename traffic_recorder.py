@@ -0,0 +1,134 @@
+import gzip
+import json
+import os
+import re
+import threading
+import time
+
+from flask import request
+
+# 트래픽 기록 파일 경로 (설정 시에만 기록, .gz 확장자면 gzip 압축)
+TRAFFIC_RECORD_PATH = os.environ.get("TRAFFIC_RECORD_PATH")
+
+# Slack 토큰 및 민감 필드 마스킹 규칙
+TOKEN_PATTERN = re.compile(r"xox[abposr]-[0-9A-Za-z-]+|xapp-[0-9A-Za-z-]+")
+SENSITIVE_KEYS = {"token", "bot_token", "app_token", "access_token", "signing_secret", "authorization"}
+REDACTED = "[REDACTED]"
+
+FLUSH_EVERY = 100
+# 기록이 뜸해도 이 주기(초)마다 flush (비정상 종료 시에도 직전 flush 까지는 읽을 수 있음)
+FLUSH_INTERVAL = 1.0
+
+
+def redact(value):
+    """중첩 dict/list 내부의 토큰 값을 재귀적으로 마스킹"""
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in SENSITIVE_KEYS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    if isinstance(value, str):
+        return TOKEN_PATTERN.sub(REDACTED, value)
+    return value
+
+
+def open_recording(path, mode):
+    """확장자에 따라 일반/gzip 텍스트 파일 열기"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TrafficRecorder:
+    """Socket Mode 이벤트와 /detect 요청을 JSON Lines 파일로 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self.started = time.monotonic()
+        self.count = 0
+        self._file = open_recording(path, "w")
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._closed = False
+        threading.Thread(target=self._flush_loop, name="TrafficFlushThread", daemon=True).start()
+
+    def record(self, kind, payload, **fields):
+        """기록 시작 시점 기준 상대 시각과 함께 한 건 기록 (fields: workspace, query 등 재생에 필요한 부가 정보)"""
+        entry = {
+            "t": round(time.monotonic() - self.started, 6),
+            "kind": kind,
+            "payload": redact(payload),
+        }
+        entry.update({k: redact(v) for k, v in fields.items() if v})
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._closed:
+                return
+            self._file.write(line + "\n")
+            self.count += 1
+            self._dirty = True
+            if self.count % FLUSH_EVERY == 0:
+                self.flush()
+
+    def flush(self):
+        """버퍼 내용을 파일에 반영 (gzip 은 동기화 지점까지 압축하여 종료 표시 없이도 읽을 수 있음)"""
+        if self._dirty and not self._closed:
+            self._file.flush()
+            self._dirty = False
+
+    def _flush_loop(self):
+        while not self._closed:
+            time.sleep(FLUSH_INTERVAL)
+            with self._lock:
+                self.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._file.close()
+
+
+def load_recording(path):
+    """기록 파일을 읽어 (상대 시각, 종류, payload) 목록 반환
+
+    종료 처리 없이 끊긴 기록(gzip 종료 표시 누락, 마지막 줄 일부만 기록)은 온전한 줄까지만 읽음
+    """
+    lines = []
+    with open_recording(path, "r") as f:
+        try:
+            for line in f:
+                lines.append(line)
+        except EOFError:
+            pass
+
+    records = []
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            if index == len(lines) - 1 and not line.endswith("\n"):
+                break
+            raise
+    return records
+
+
+def install_recorder(path, slack_app, flask_app):
+    """Bolt App 미들웨어와 Flask before_request 훅으로 트래픽 기록 연결"""
+    recorder = TrafficRecorder(path)
+
+    # 재생 시 같은 워크스페이스 App 으로 보낼 수 있도록 이벤트가 들어온 워크스페이스 key 와 팀 ID 기록
+    @slack_app.middleware
+    def record_socket_event(body, context, next):
+        recorder.record("socket", body, workspace=context.get("workspace_key"), team=context.team_id)
+        return next()
+
+    # ?workspace= 등으로 대상을 지정한 요청을 그대로 재현할 수 있도록 쿼리 문자열도 기록
+    @flask_app.before_request
+    def record_detect_request():
+        if request.path == "/detect" and request.method == "POST":
+            recorder.record("detect", request.get_json(silent=True),
+                            query=request.query_string.decode("utf-8"))
+
+    return recorder
@@ -0,0 +1,202 @@
+import json
+import os
+import threading
+import time
+
+import slack_sdk
+from slack_bolt import App
+
+from slack_directory import SlackDirectory
+from structured_log import log
+
+# 멀티 워크스페이스 설정 (WORKSPACES_CONFIG 미설정 시 기존 단일 워크스페이스 환경 변수 사용)
+WORKSPACES_CONFIG = os.environ.get("WORKSPACES_CONFIG")
+DEFAULT_WORKSPACE = os.environ.get("DEFAULT_WORKSPACE", "default")
+# 속도 제한 대기 중인 전송의 최대 개수 (초과 시 WorkspaceBusy)
+WORKSPACE_QUEUE_SIZE = int(os.environ.get("WORKSPACE_QUEUE_SIZE", "1000"))
+# 기존 단일 워크스페이스 배포는 속도 제한 없이 동작하도록 WORKSPACES_CONFIG 사용 시에만 기본 제한 적용
+WORKSPACE_RATE_LIMIT = float(os.environ.get("WORKSPACE_RATE_LIMIT", "10" if WORKSPACES_CONFIG else "0"))
+WORKSPACE_BURST = int(os.environ.get("WORKSPACE_BURST", "20"))
+WORKSPACE_SEND_TIMEOUT = float(os.environ.get("WORKSPACE_SEND_TIMEOUT", "30"))
+# true 면 리스너 실행이 끝난 뒤 응답 (트래픽 재생 시 핸들러 지연/오류 측정용)
+SLACK_PROCESS_BEFORE_RESPONSE = os.environ.get("SLACK_PROCESS_BEFORE_RESPONSE", "false").lower() == "true"
+
+
+class WorkspaceBusy(Exception):
+    """워크스페이스 전송 대기열이 가득 찼거나 제한 시간 안에 전송 차례가 오지 않는 경우"""
+
+
+class TokenBucket:
+    """초당 rate 건, 최대 burst 건까지 허용하는 토큰 버킷"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=None):
+        """토큰 하나를 예약하고 사용 가능 시점까지 대기 (timeout 안에 얻을 수 없으면 예약하지 않고 False)"""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # 토큰이 음수가 되도록 미리 예약하여 대기자가 도착 순서대로 차례를 받음
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                return False
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+        return True
+
+
+class Workspace:
+    """워크스페이스별 Bolt App, WebClient, 전송 대기열 및 속도 제한"""
+
+    def __init__(self, key, bot_token, signing_secret, app_token=None, rater_channel=None,
+                 base_url=slack_sdk.WebClient.BASE_URL, ssl_context=None,
+                 queue_size=WORKSPACE_QUEUE_SIZE, rate_limit=WORKSPACE_RATE_LIMIT,
+                 burst=WORKSPACE_BURST, timeout=WORKSPACE_SEND_TIMEOUT):
+        self.key = key
+        self.bot_token = bot_token
+        self.app_token = app_token
+        self.rater_channel = rater_channel
+        self.timeout = timeout
+
+        # 명령어 응답(say), warm-up 및 알림 전송에 공유하는 클라이언트 (호출마다 연결을 따로 열어 스레드 간 공유 가능)
+        self.client = slack_sdk.WebClient(token=bot_token, base_url=base_url, ssl=ssl_context)
+        self.app = App(
+            client=self.client,
+            signing_secret=signing_secret,
+            process_before_response=SLACK_PROCESS_BEFORE_RESPONSE
+        )
+        self.directory = SlackDirectory(self.client)
+
+        # 속도 제한: 워크스페이스마다 독립적이라 한 워크스페이스가 밀려도 다른 곳에 영향 없음
+        # 전송은 요청 스레드에서 직접 수행하므로 동시 전송 수는 요청 동시성을 그대로 따름
+        self.queue_size = queue_size
+        self._limiter = TokenBucket(rate_limit, burst)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def call(self, method, timeout=None, **kwargs):
+        """Slack Web API 호출 (속도 제한 시 차례를 기다리며, 대기열이 가득 찼거나 제한 시간 안에 차례가 오지 않으면 WorkspaceBusy)"""
+        if self._limiter.rate <= 0:
+            return getattr(self.client, method)(**kwargs)
+
+        with self._pending_lock:
+            if self._pending >= self.queue_size:
+                raise WorkspaceBusy(f"워크스페이스 '{self.key}' 전송 대기열이 가득 찼습니다")
+            self._pending += 1
+        try:
+            # 토큰을 먼저 얻은 뒤에만 전송하므로, 차례가 오지 않아 포기한 알림이 뒤늦게 전송되는 일이 없음
+            if not self._limiter.acquire(timeout or self.timeout):
+                raise WorkspaceBusy(f"워크스페이스 '{self.key}' 전송 대기 시간이 제한을 넘습니다")
+            return getattr(self.client, method)(**kwargs)
+        finally:
+            with self._pending_lock:
+                self._pending -= 1
+
+    def stats(self):
+        return {"pending": self._pending, "rate_limit": self._limiter.rate}
+
+
+def _workspace_tagger(key):
+    """요청이 들어온 워크스페이스 key 를 context["workspace_key"] 에 남기는 미들웨어 생성"""
+    # Bolt 는 인자 이름으로 값을 주입하므로 기본값 인자 대신 클로저로 key 를 고정
+    def tag_workspace(context, next):
+        context["workspace_key"] = key
+        return next()
+    return tag_workspace
+
+
+class AppGroup:
+    """여러 워크스페이스의 Bolt App 에 같은 핸들러를 한 번에 등록하는 묶음"""
+
+    def __init__(self, apps):
+        # 워크스페이스 key → App (첫 번째 항목이 기본 워크스페이스)
+        self.apps = dict(apps)
+        for key, app in self.apps.items():
+            app.middleware(_workspace_tagger(key))
+
+    def _register(self, name, *args, **kwargs):
+        def decorator(func):
+            for app in self.apps.values():
+                getattr(app, name)(*args, **kwargs)(func)
+            return func
+        return decorator
+
+    def message(self, *args, **kwargs):
+        return self._register("message", *args, **kwargs)
+
+    def event(self, *args, **kwargs):
+        return self._register("event", *args, **kwargs)
+
+    def middleware(self, func):
+        for app in self.apps.values():
+            app.middleware(func)
+        return func
+
+    def error(self, func):
+        for app in self.apps.values():
+            app.error(func)
+        return func
+
+    def dispatch(self, req, workspace=None):
+        """workspace 의 App 으로 요청 처리 (미지정 시 기본 워크스페이스, 재생 도구 등)"""
+        if workspace is None:
+            return next(iter(self.apps.values())).dispatch(req)
+        if workspace not in self.apps:
+            raise KeyError(f"워크스페이스 '{workspace}' 가 설정되지 않았습니다")
+        return self.apps[workspace].dispatch(req)
+
+
+def _config_value(config, name):
+    """설정 값 또는 '<name>_env' 로 지정한 환경 변수 값 반환"""
+    if config.get(name):
+        return config[name]
+    env_name = config.get(f"{name}_env")
+    return os.environ.get(env_name) if env_name else None
+
+
+def load_workspaces(default_config, base_url, ssl_context, config_path=WORKSPACES_CONFIG):
+    """워크스페이스 설정 파일(JSON)을 읽어 key → Workspace 사전 반환"""
+    if config_path:
+        with open(config_path, encoding="utf-8") as f:
+            configs = json.load(f)
+        if isinstance(configs, dict):
+            configs = [dict(config, key=key) for key, config in configs.items()]
+    else:
+        configs = [dict(default_config, key=DEFAULT_WORKSPACE)]
+
+    workspaces = {}
+    for config in configs:
+        key = config["key"]
+        bot_token = _config_value(config, "bot_token")
+        signing_secret = _config_value(config, "signing_secret")
+        app_token = _config_value(config, "app_token")
+        if not bot_token or not signing_secret or not app_token:
+            raise ValueError(f"워크스페이스 '{key}' 의 bot_token/signing_secret/app_token 이 설정되지 않았습니다")
+
+        workspaces[key] = Workspace(
+            key=key,
+            bot_token=bot_token,
+            signing_secret=signing_secret,
+            app_token=app_token,
+            rater_channel=config.get("rater_channel"),
+            base_url=base_url,
+            ssl_context=ssl_context,
+            queue_size=int(config.get("queue_size", WORKSPACE_QUEUE_SIZE)),
+            rate_limit=float(config.get("rate_limit", WORKSPACE_RATE_LIMIT)),
+            burst=int(config.get("burst", WORKSPACE_BURST)),
+            timeout=float(config.get("timeout", WORKSPACE_SEND_TIMEOUT)),
+        )
+        log.info("startup", "workspace_loaded", workspace=key, rater_channel=config.get("rater_channel"))
+
+    if not workspaces:
+        raise ValueError("설정된 워크스페이스가 없습니다")
+    return workspaces